@@ -1,15 +1,24 @@
 import streamlit as st
 from fast_agent import FastQueryRouter, format_date, format_date_full, format_date_aest, format_date_full_aest, iso_date_aest
 import time
+import numpy as np
 import pandas as pd
 import json
 import os
 import re
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import chain
 import pytz
+import threading
 import uuid
-import plotly.graph_objects as go
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import io
 import random
 from insights import show_insights_page
@@ -26,6 +35,7 @@ from player_config import (
 )
 # ADD after imports:
 SESSION_TIMEOUT_MINUTES = 240  # 4 hours
+SESSION_TIMEOUT_SECONDS = SESSION_TIMEOUT_MINUTES * 60
 
 def get_client_ip():
     """Get client IP address from Streamlit request headers"""
@@ -89,7 +99,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better visuals
-st.markdown("""
+_CSS = """
 <style>
     /* Main header styling */
     .main-header {
@@ -175,7 +185,11 @@ st.markdown("""
     }
 
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Streamlit drops any element a rerun doesn't emit again, so the stylesheet
+# has to be written on every run rather than once per session.
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # ---------------------------------------------------------
 # Get base directory
@@ -183,94 +197,60 @@ st.markdown("""
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
+# Resolved once; pytz.timezone() looks the zone up on every call
+MELBOURNE_TZ = pytz.timezone("Australia/Melbourne")
+
 # ---------------------------------------------------------
 # Session Management
 # ---------------------------------------------------------
 
+# Per-session defaults; callables are evaluated only when the key is missing
+_SESSION_DEFAULTS = {
+    "authenticated": False,
+    "username": None,
+    "full_name": None,
+    "role": None,
+    "session_id": lambda: str(uuid.uuid4()),
+    # Try to read device_id injected by the JS snippet below
+    "device_id": lambda: st.query_params.get("_did", ""),
+    "last_activity": time.monotonic,
+    "level": "league",
+    "selected_league": None,
+    "selected_competition": None,
+    "selected_club": None,
+    "selected_player": None,
+    "selected_match_id": None,
+    "last_search": "",
+    "expander_state": False,
+    "expander_collapse_counter": 0,
+    "show_season_page": False,
+    "season_auto_load": False,
+    "show_predictions_page": False,
+    "user_type": None,  # 'player' or 'admin'
+    "player_club": None,
+    "player_age_group": None,
+    "player_role": None,
+    "player_league": None,
+    "show_insights_page": False,
+}
+
 def init_session_state():
     """Initialize session state variables"""
-    if "authenticated" not in st.session_state:
-        st.session_state["authenticated"] = False
-    
-    if "username" not in st.session_state:
-        st.session_state["username"] = None
-    
-    if "full_name" not in st.session_state:
-        st.session_state["full_name"] = None
-    
-    if "role" not in st.session_state:
-        st.session_state["role"] = None
-    
-    if "session_id" not in st.session_state:
-        st.session_state["session_id"] = str(uuid.uuid4())
-
-    if "device_id" not in st.session_state:
-        # Try to read device_id injected by the JS snippet below
-        st.session_state["device_id"] = st.query_params.get("_did", "")
-    
-    if "last_activity" not in st.session_state:
-        st.session_state["last_activity"] = datetime.now()
-    
-    if "level" not in st.session_state:
-        st.session_state["level"] = "league"
-    
-    if "selected_league" not in st.session_state:
-        st.session_state["selected_league"] = None
-    
-    if "selected_competition" not in st.session_state:
-        st.session_state["selected_competition"] = None
-    
-    if "selected_club" not in st.session_state:
-        st.session_state["selected_club"] = None
-    
-    if "selected_player" not in st.session_state:
-        st.session_state["selected_player"] = None
-    
-    if "selected_match_id" not in st.session_state:
-        st.session_state["selected_match_id"] = None
-    
-    if "last_search" not in st.session_state:
-        st.session_state["last_search"] = ""
-        
-    if "expander_state" not in st.session_state:
-        st.session_state["expander_state"] = False
-    if "expander_collapse_counter" not in st.session_state:
-        st.session_state["expander_collapse_counter"] = 0
-    if "show_season_page" not in st.session_state:
-        st.session_state["show_season_page"] = False
-    if "season_auto_load" not in st.session_state:
-        st.session_state["season_auto_load"] = False
-    if "show_predictions_page" not in st.session_state:
-        st.session_state["show_predictions_page"] = False
-    if "user_type" not in st.session_state:
-        st.session_state["user_type"] = None  # 'player' or 'admin'
-    
-    if "player_club" not in st.session_state:
-        st.session_state["player_club"] = None
-    
-    if "player_age_group" not in st.session_state:
-        st.session_state["player_age_group"] = None
-    
-    if "player_role" not in st.session_state:
-        st.session_state["player_role"] = None
-    
-    if "player_league" not in st.session_state:
-        st.session_state["player_league"] = None
-    
-    if "show_insights_page" not in st.session_state:
-        st.session_state["show_insights_page"] = False    
+    state = st.session_state
+    for key, default in _SESSION_DEFAULTS.items():
+        if key not in state:
+            state[key] = default() if callable(default) else default
 
 def check_session_timeout():
     """Check if session has timed out"""
     if st.session_state["authenticated"]:
-        time_diff = datetime.now() - st.session_state["last_activity"]
-        if time_diff.total_seconds() > (SESSION_TIMEOUT_MINUTES * 260):
+        if time.monotonic() - st.session_state["last_activity"] > SESSION_TIMEOUT_SECONDS:
             logout_user()
             st.warning(f"Session timed out after {SESSION_TIMEOUT_MINUTES} minutes of inactivity")
             return False
         
         # Update last activity
-        st.session_state["last_activity"] = datetime.now()
+        st.session_state["last_activity"] = time.monotonic()
     return True
 
    
@@ -303,16 +283,18 @@ def logout_user():
 # ---------------------------------------------------------
 
 
+_LOGIN_HEADER_HTML = """
+    <div class="main-header">
+        <h2 style='margin:0; padding:0;'>⚽ Junior Pro Football Intelligence</h2>
+        <p style='margin:0.5rem 0 0 0; font-size:16px; opacity:0.9;'>
+            Welcome! Please select your profile to continue
+        </p>
+    </div>
+"""
+
 def show_login_page():
     """Display player selection page"""
-    st.markdown("""
-        <div class="main-header">
-            <h2 style='margin:0; padding:0;'>⚽ Junior Pro Football Intelligence</h2>
-            <p style='margin:0.5rem 0 0 0; font-size:16px; opacity:0.9;'>
-                Welcome! Please select your profile to continue
-            </p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_LOGIN_HEADER_HTML, unsafe_allow_html=True)
     
     col1, col2, col3 = st.columns([1, 2, 1])
     
@@ -339,7 +321,7 @@ def show_login_page():
                     st.session_state["player_age_group"] = saved_selection.get("age_group", "")
                     st.session_state["player_role"] = saved_selection["role"]
                     st.session_state["role"] = saved_selection["role"]
-                    st.session_state["last_activity"] = datetime.now()
+                    st.session_state["last_activity"] = time.monotonic()
                     st.session_state["player_league"] = selected_person.get("league", "")
                     st.session_state["player_competition"] = selected_person.get("competition", "")
                     # Update USER_CONFIG in fast_agent
@@ -379,7 +361,7 @@ def show_login_page():
             st.session_state["player_age_group"] = "U16"
             st.session_state["player_role"] = "player"
             st.session_state["role"] = "player"
-            st.session_state["last_activity"] = datetime.now()
+            st.session_state["last_activity"] = time.monotonic()
             st.session_state["player_league"] = league
             st.session_state["player_competition"] = competition
             update_user_config("Heidelberg United", "U16")
@@ -401,15 +383,12 @@ def show_login_page():
         st.markdown("### 👤 Or Select a Specific Player/Coach Profile")
         
         # Load all players and coaches
-        people = get_players_and_coaches_list(DATA_DIR)
+        people, _, people_by_display, _, options = people_index(_people_version())
         
         if not people:
             st.error("❌ No player or coach data found. Please ensure data files are loaded.")
             return
         
-        # Create dropdown options
-        options = [""] + [format_player_display(p) for p in people]
-        
         selected_display = st.selectbox(
             "Search your name (optional):",
             options=options,
@@ -419,11 +398,7 @@ def show_login_page():
         
         if selected_display and selected_display != "":
             # Find the person data
-            selected_person = None
-            for person in people:
-                if format_player_display(person) == selected_display:
-                    selected_person = person
-                    break
+            selected_person = people_by_display.get(selected_display)
             
             if selected_person:
                 # Login immediately — no button needed
@@ -435,7 +410,7 @@ def show_login_page():
                 st.session_state["player_age_group"] = selected_person.get("age_group", "")
                 st.session_state["player_role"] = selected_person["role"]
                 st.session_state["role"] = selected_person["role"]
-                st.session_state["last_activity"] = datetime.now()
+                st.session_state["last_activity"] = time.monotonic()
                 
                 save_player_selection(st.session_state["session_id"], selected_person)
                 update_user_config(selected_person["club"], selected_person.get("age_group", ""))
@@ -472,7 +447,7 @@ def show_login_page():
                             st.session_state["username"] = admin["username"]
                             st.session_state["full_name"] = admin["full_name"]
                             st.session_state["role"] = "admin"
-                            st.session_state["last_activity"] = datetime.now()
+                            st.session_state["last_activity"] = time.monotonic()
                             # Default player context to Shaurya / Heidelberg United U16
                             st.session_state["player_club"] = "Heidelberg United"
                             st.session_state["player_age_group"] = "U16"
@@ -501,6 +476,11 @@ def show_login_page():
 
 def get_last_updated_time():
     """Get the last data update time from last_updated.json written by pipeline."""
+    return _last_updated_text(_file_mtimes("last_updated.json", "master_results.json"))
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _last_updated_text(version):
+    """Formatted timestamp; version is the source files' mtimes, so it only re-reads after a pipeline run."""
     # Primary: dedicated last_updated.json written at end of each pipeline run
     lu_path = os.path.join(DATA_DIR, "last_updated.json")
     if os.path.exists(lu_path):
@@ -510,10 +490,9 @@ def get_last_updated_time():
             ts = data.get("last_updated", "")
             if ts:
                 update_time = datetime.fromisoformat(ts)
-                aest = pytz.timezone("Australia/Melbourne")
                 if update_time.tzinfo is None:
                     update_time = pytz.UTC.localize(update_time)
-                return update_time.astimezone(aest).strftime("%a, %d %b %Y, %I:%M %p AEST")
+                return update_time.astimezone(MELBOURNE_TZ).strftime("%a, %d %b %Y, %I:%M %p AEST")
         except Exception:
             pass
 
@@ -523,9 +502,7 @@ def get_last_updated_time():
         return "Data file not found"
     try:
         mod_time = os.path.getmtime(results_path)
-        utc_time = datetime.fromtimestamp(mod_time, tz=pytz.UTC)
-        aest = pytz.timezone("Australia/Melbourne")
-        aest_time = utc_time.astimezone(aest)
+        aest_time = datetime.fromtimestamp(mod_time, tz=MELBOURNE_TZ)
         return aest_time.strftime("%a, %d %b %Y, %I:%M %p AEST") + " (approx)"
     except Exception as e:
         return f"Error reading timestamp: {str(e)}"
@@ -536,138 +513,143 @@ def get_last_updated_time():
 
 @st.cache_resource
 def load_router():
-    """Load the query router (cached per session)"""
+    """Load the query router (built once per process, shared by all sessions)"""
     return FastQueryRouter()
 
 router = load_router()
 
+# Natural-language queries run on a worker thread so a slow route doesn't
+# freeze the page. Fast routes usually finish within the inline wait and
+# land in the same run; slower ones are polled by _poll_nl_query.
+NL_INLINE_WAIT_SECONDS = 0.5
+
+@st.cache_resource
+def load_query_pool():
+    """Worker pool for router.process, shared by every session.
+
+    One worker per CPU: up to that many NL queries run at once across all
+    users and the rest queue in submit order, so a dropped query must be
+    cancelled (_drop_nl_query).
+    """
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 2, thread_name_prefix="nl-query")
+
+def _drop_nl_query():
+    """Forget this session's pending NL query, cancelling it if still queued."""
+    fut = st.session_state.pop("_nl_future", None)
+    if fut is not None:
+        fut.cancel()
+
+def _timed_process(query, ctx):
+    """Run a query through the router, returning (answer, seconds taken).
+
+    ctx is the submitting session's ScriptRunContext, attached to the worker
+    so the router's st.cache_data data refresh runs as part of that session.
+    """
+    add_script_run_ctx(threading.current_thread(), ctx)
+    t0 = time.time()
+    answer = router.process(query)
+    return answer, round(time.time() - t0, 3)
+
+@st.fragment(run_every=0.5)
+def _poll_nl_query():
+    """Placeholder for a running query — reruns the whole app once it lands."""
+    fut = st.session_state.get("_nl_future")
+    if fut is None or fut.done():
+        st.rerun()
+    st.info("🧠 Analyzing...")
+
 # ---------------------------------------------------------
 # Data loaders
 # ---------------------------------------------------------
-
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_master_results():
-    """Load master_results.json"""
-    path = os.path.join(DATA_DIR, "master_results.json")
+# cache_resource, not cache_data: every session shares one parsed copy
+# instead of unpickling the full JSON on each rerun. Callers treat the
+# returned objects as read-only.
+#
+# Each loader is keyed on its file's mtime (pass _file_mtimes(<file>)), so
+# a pipeline rewrite is picked up on the next rerun and an unchanged file
+# is never re-parsed; max_entries=1 drops the previous copy.
+
+def _read_json(path):
+    """Parse a JSON data file, using orjson on the raw bytes when installed."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _load_json_list(name, keys, what):
+    """List stored in DATA_DIR/name: the first of `keys` present, else the first list value."""
+    path = os.path.join(DATA_DIR, name)
     
     if not os.path.exists(path):
         return []
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         if isinstance(data, dict):
-            if "results" in data:
-                return data["results"]
-            elif "data" in data:
-                return data["data"]
-            elif "matches" in data:
-                return data["matches"]
-            else:
-                for key, value in data.items():
-                    if isinstance(value, list):
-                        return value
-                return []
-        elif isinstance(data, list):
-            return data
-        else:
+            for key in keys:
+                if key in data:
+                    return data[key]
+            for value in data.values():
+                if isinstance(value, list):
+                    return value
             return []
-    except Exception as e:
-        st.error(f"Error loading results: {str(e)}")
-        return []
-
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_fixtures():
-    """Load fixtures.json"""
-    path = os.path.join(DATA_DIR, "fixtures.json")
-    
-    if not os.path.exists(path):
-        return []
-    
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        if isinstance(data, dict):
-            if "fixtures" in data:
-                return data["fixtures"]
-            elif "data" in data:
-                return data["data"]
-            elif "matches" in data:
-                return data["matches"]
-            else:
-                for key, value in data.items():
-                    if isinstance(value, list):
-                        return value
-                return []
         elif isinstance(data, list):
             return data
         else:
             return []
     except Exception as e:
-        st.error(f"Error loading fixtures: {str(e)}")
+        st.error(f"Error loading {what}: {str(e)}")
         return []
 
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_players_summary():
-    """Load players_summary.json"""
-    path = os.path.join(DATA_DIR, "players_summary.json")
+def _load_json_summary(name, key):
+    """Summary file as {key: [...]}, wrapping a bare list or the first list value if needed."""
+    path = os.path.join(DATA_DIR, name)
     
     if not os.path.exists(path):
-        return {"players": []}
+        return {key: []}
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         if isinstance(data, dict):
-            if "players" in data:
+            if key in data:
                 return data
-            else:
-                for key, value in data.items():
-                    if isinstance(value, list):
-                        return {"players": value}
-                return {"players": []}
+            for value in data.values():
+                if isinstance(value, list):
+                    return {key: value}
+            return {key: []}
         elif isinstance(data, list):
-            return {"players": data}
+            return {key: data}
         else:
-            return {"players": []}
+            return {key: []}
     except Exception as e:
-        st.error(f"Error loading players: {str(e)}")
-        return {"players": []}
+        st.error(f"Error loading {key}: {str(e)}")
+        return {key: []}
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_master_results(version):
+    """Load master_results.json"""
+    return _load_json_list("master_results.json", ("results", "data", "matches"), "results")
 
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_fixtures(version):
+    """Load fixtures.json"""
+    return _load_json_list("fixtures.json", ("fixtures", "data", "matches"), "fixtures")
 
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_staff_summary():
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_players_summary(version):
+    """Load players_summary.json"""
+    return _load_json_summary("players_summary.json", "players")
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_staff_summary(version):
     """Load staff_summary.json"""
-    path = os.path.join(DATA_DIR, "staff_summary.json")
-    
-    if not os.path.exists(path):
-        return {"staff": []}
-    
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        if isinstance(data, dict):
-            if "staff" in data:
-                return data
-            else:
-                for key, value in data.items():
-                    if isinstance(value, list):
-                        return {"staff": value}
-                return {"staff": []}
-        elif isinstance(data, list):
-            return {"staff": data}
-        else:
-            return {"staff": []}
-    except Exception as e:
-        st.error(f"Error loading staff: {str(e)}")
-        return {"staff": []}
+    return _load_json_summary("staff_summary.json", "staff")
 
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_competition_overview():
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_competition_overview(version):
     """Load competition_overview.json"""
     path = os.path.join(DATA_DIR, "competition_overview.json")
     
@@ -675,8 +657,7 @@ def load_competition_overview():
         return {}
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         if isinstance(data, dict):
             return data
@@ -686,35 +667,63 @@ def load_competition_overview():
         st.error(f"Error loading competition overview: {str(e)}")
         return {}
 
+_APP_DATA_FILES = ("master_results.json", "fixtures.json", "players_summary.json",
+                   "staff_summary.json", "competition_overview.json")
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_app_data(version):
+    """(results, fixtures, players, staff, competition overview) in one cached fetch.
+
+    version is _file_mtimes(*_APP_DATA_FILES); each loader still gets its own
+    file's mtime, so their caches stay shared with the other call sites.
+    """
+    return (
+        load_master_results(version[0:1]),
+        load_fixtures(version[1:2]),
+        load_players_summary(version[2:3]),
+        load_staff_summary(version[3:4]),
+        load_competition_overview(version[4:5]),
+    )
+
 def force_reload_all_data():
     """Force reload of all data including fast_agent module data"""
-    import importlib
-    import sys
-    
-    # Clear Streamlit caches
+    # Clear Streamlit caches. Only the data loaders are dropped from
+    # cache_resource — the router and query pool stay alive.
     st.cache_data.clear()
-    st.cache_resource.clear()
+    for loader in (load_app_data, load_master_results, load_fixtures, load_players_summary,
+                   load_staff_summary, load_competition_overview):
+        loader.clear()
     
-    # Force reimport of fast_agent to reload its module-level data
-    if 'fast_agent' in sys.modules:
-        importlib.reload(sys.modules['fast_agent'])
+    # Drop memoised names from the previous data set
+    for memo in (base_club_name, extract_competition_from_league_name,
+                 extract_competition_from_league, extract_league_from_league_name):
+        memo.cache_clear()
     
-    # Reinitialize router with fresh data
-    global router
-    from fast_agent import FastQueryRouter
-    router = FastQueryRouter()
+    # Refresh fast_agent's module-level data in place
+    router.reload_data()
 
 # ---------------------------------------------------------
 # Helper functions (same as before)
 # ---------------------------------------------------------
 
+_AGE_SUFFIX_RE = re.compile(r'\s+U\d{2}$')
+
+@lru_cache(maxsize=4096)
 def base_club_name(team_name: str) -> str:
     if not team_name:
         return ""
-    pattern = r'\s+U\d{2}$'
-    cleaned = re.sub(pattern, '', team_name).strip()
+    cleaned = _AGE_SUFFIX_RE.sub('', team_name).strip()
     return cleaned
 
+def base_club_name_series(team_names: pd.Series) -> pd.Series:
+    """base_club_name over a whole column, in pandas' string methods."""
+    return team_names.fillna("").str.replace(_AGE_SUFFIX_RE, "", regex=True).str.strip()
+
+def mark_club_teams(team_names: pd.Series, club_token: str) -> pd.Series:
+    """Prefix "▶ " to the team names whose lowercase form contains club_token."""
+    hit = team_names.str.lower().str.contains(club_token, regex=False, na=False)
+    return team_names.mask(hit, "▶ " + team_names)
+
 
 def get_player_reg_info(player: dict, current_club: str, current_comp: str) -> dict:
     """Classify dual registrations relative to current club/competition."""
@@ -758,6 +767,40 @@ def get_player_reg_info(player: dict, current_club: str, current_comp: str) -> d
             "diff_clubs": diff_clubs, "badge": badge}
 
 
+# League-name classification. Each table is one anchored alternation of
+# lookaheads, so the branches are tried in the same priority order as the
+# original if/elif chains and a single match() picks the winner.
+_COMP_NAME_RE = re.compile(
+    r"^(?:"
+    r"(?=.*(?:YPL1|Youth Premier League 1))(?P<ypl1>)"
+    r"|(?=.*(?:YPL2|Youth Premier League 2))(?P<ypl2>)"
+    r"|(?=.*YSL)(?=.*(?:North-West|NW))(?P<ysl_nw>)"
+    r"|(?=.*YSL)(?=.*(?:South-East|SE))(?P<ysl_se>)"
+    r"|(?=.*VPL Men)(?P<vpl_men>)"
+    r"|(?=.*VPL Women)(?P<vpl_women>)"
+    r"|(?=.*YSL)(?P<ysl>)"
+    r")",
+    re.DOTALL,
+)
+_LEAGUE_CODE_RE = re.compile(
+    r"^(?:"
+    r"(?=.*ypl ?1)(?P<ypl1>)"
+    r"|(?=.*ypl ?2)(?P<ypl2>)"
+    r"|(?=.*ysl)(?=.*(?:north[- ]west|nw))(?P<ysl_nw>)"
+    r"|(?=.*ysl)(?=.*(?:south[- ]east|se))(?P<ysl_se>)"
+    r"|(?=.*vpl men)(?P<vpl_men>)"
+    r"|(?=.*vpl women)(?P<vpl_women>)"
+    r"|(?=.*ysl)(?P<ysl>)"
+    r"|(?=.*vpl)(?P<vpl>)"
+    r")",
+    re.IGNORECASE | re.DOTALL,
+)
+_LEAGUE_CODES = {
+    "ypl1": "YPL1", "ypl2": "YPL2", "ysl_nw": "YSL NW", "ysl_se": "YSL SE",
+    "vpl_men": "VPL Men", "vpl_women": "VPL Women", "ysl": "YSL", "vpl": "VPL",
+}
+
+@lru_cache(maxsize=2048)
 def extract_competition_from_league_name(league_name: str) -> str:
     """
     Extract competition with age group from league name.
@@ -770,100 +813,43 @@ def extract_competition_from_league_name(league_name: str) -> str:
     if len(parts) < 2:
         return league_name
     
-    # First part is usually the age group (U13, U14, U15, U16, U18)
-    age = parts[0]
-    
-    # Determine which league it belongs to
-    if "YPL1" in league_name or "Youth Premier League 1" in league_name:
-        return f"{age} YPL1"
-    if "YPL2" in league_name or "Youth Premier League 2" in league_name:
-        return f"{age} YPL2"
-    if "YSL" in league_name and ("North-West" in league_name or "NW" in league_name):
-        return f"{age} YSL NW"
-    if "YSL" in league_name and ("South-East" in league_name or "SE" in league_name):
-        return f"{age} YSL SE"
-    if "VPL Men" in league_name:
-        return f"{age} VPL Men"
-    if "VPL Women" in league_name:
-        return f"{age} VPL Women"
-    if "YSL" in league_name:
-        return f"{age} YSL"
+    m = _COMP_NAME_RE.match(league_name)
+    if m:
+        # First part is usually the age group (U13, U14, U15, U16, U18)
+        return f"{parts[0]} {_LEAGUE_CODES[m.lastgroup]}"
     
     # Fallback: return original
     return league_name
     
+@lru_cache(maxsize=2048)
 def extract_competition_from_league(league_name: str) -> str:
     """Extract competition code from full league name"""
     if not league_name:
         return ""
     
-    league_lower = league_name.lower()
-    
-    # Check for each competition type
-    if "ypl1" in league_lower or "ypl 1" in league_lower:
-        return "YPL1"
-    elif "ypl2" in league_lower or "ypl 2" in league_lower:
-        return "YPL2"
-    elif "ysl" in league_lower and ("north-west" in league_lower or "nw" in league_lower or "north west" in league_lower):
-        return "YSL NW"
-    elif "ysl" in league_lower and ("south-east" in league_lower or "se" in league_lower or "south east" in league_lower):
-        return "YSL SE"
-    elif "vpl men" in league_lower:
-        return "VPL Men"
-    elif "vpl women" in league_lower:
-        return "VPL Women"
-    elif "ysl" in league_lower:
-        return "YSL"
-    elif "vpl" in league_lower:
-        return "VPL"
+    m = _LEAGUE_CODE_RE.match(league_name)
+    if m:
+        return _LEAGUE_CODES[m.lastgroup]
     
     # If no match, return original
     return league_name
 
+@lru_cache(maxsize=2048)
 def extract_league_from_league_name(league_name: str) -> str:
     """Extract league from league name (YPL1, YPL2, YSL NW, etc.)"""
     if not league_name:
         return "Other"
     
-    league_name_lower = str(league_name).lower()
-    
-    if "ypl1" in league_name_lower or "ypl 1" in league_name_lower:
-        return "YPL1"
-    if "ypl2" in league_name_lower or "ypl 2" in league_name_lower:
-        return "YPL2"
-    if "ysl" in league_name_lower and ("north-west" in league_name_lower or "nw" in league_name_lower or "north west" in league_name_lower):
-        return "YSL NW"
-    if "ysl" in league_name_lower and ("south-east" in league_name_lower or "se" in league_name_lower or "south east" in league_name_lower):
-        return "YSL SE"
-    if "vpl men" in league_name_lower:
-        return "VPL Men"
-    if "vpl women" in league_name_lower:
-        return "VPL Women"
-    if "ysl" in league_name_lower:
-        return "YSL"
+    m = _LEAGUE_CODE_RE.match(str(league_name))
+    if m and m.lastgroup != "vpl":
+        return _LEAGUE_CODES[m.lastgroup]
     
     return "Other"
 
 def get_all_leagues(results, fixtures):
     leagues = set()
     
-    for item in results:
-        if not isinstance(item, dict):
-            continue
-        league_name = None
-        if "attributes" in item:
-            attrs = item.get("attributes", {})
-            league_name = attrs.get("league_name")
-            if not league_name:
-                league_name = attrs.get("competition_name") or attrs.get("league")
-        if not league_name:
-            league_name = item.get("league_name") or item.get("competition_name") or item.get("league")
-        if league_name:
-            extracted = extract_competition_from_league(str(league_name))
-            if extracted != "Other":
-                leagues.add(extracted)
-
-    for item in fixtures:
+    for item in chain(results, fixtures):
         if not isinstance(item, dict):
             continue
         league_name = None
@@ -895,37 +881,11 @@ def get_competitions_for_league(results, fixtures, league):
             comps.add(extract_competition_from_league_name(league_name))
     return sorted(list(comps))
     
-def get_results_for_competition(results, competition):
-    matches = []
-    for item in results:
-        attrs = item.get("attributes", {})
-        league_name = attrs.get("league_name")
-        status = attrs.get("status")
-        if league_name and status == "complete":
-            if extract_competition_from_league_name(league_name) == competition:
-                matches.append(item)
-    return matches
-
-def get_matches_for_club_in_comp(results, club_name, competition):
-    matches = []
-    for item in results:
-        attrs = item.get("attributes", {})
-        league_name = attrs.get("league_name")
-        status = attrs.get("status")
-        if status != "complete":
-            continue
-        if extract_competition_from_league_name(league_name) != competition:
-            continue
-        home = attrs.get("home_team_name")
-        away = attrs.get("away_team_name")
-        home_base = base_club_name(home)
-        away_base = base_club_name(away)
-        if home_base == club_name or away_base == club_name:
-            matches.append(item)
-    return matches
-
 def _person_teams_and_leagues(p):
     """Get (team, league) pairs for a person. Handles both team_name/league_name and teams/leagues arrays."""
+    pairs = p.get("_teams_leagues")
+    if pairs is not None:
+        return pairs
     teams = p.get("teams", [])
     leagues = p.get("leagues", [])
     if teams or leagues:
@@ -941,77 +901,152 @@ def _person_teams_and_leagues(p):
     return [(tn, ln)] if tn or ln else []
 
 
-def get_players_for_club(players_data, club_name, competition=None, staff_data=None):
+def _normalize_person(p, is_staff=False):
+    """Copy of a players/staff summary entry with team_name/league_name/role filled in."""
+    out = dict(p)
+    if not out.get("team_name") and out.get("teams"):
+        out["team_name"] = out["teams"][0] if out["teams"] else ""
+    if not out.get("league_name") and out.get("leagues"):
+        out["league_name"] = out["leagues"][0] if out["leagues"] else ""
+    if not out.get("role"):
+        roles     = out.get("roles", [])
+        role_slug = out.get("role_slug", "")
+        out["role"] = (roles[0] if roles else (role_slug or "staff")) if is_staff else "player"
+    if is_staff and "jersey" not in out:
+        out["jersey"] = ""
+    # Matches keyed by id so squad filtering / per-match stats are O(1) per person,
+    # and the team/league pairs and per-match event tallies worked out once per copy
+    out["_matches_by_id"] = _matches_by_id(out)
+    out["_teams_leagues"] = _person_teams_and_leagues(out)
+    out["_match_events"] = _match_event_counts(out)
+    return out
+
+
+def format_dates(date_strs, aest=False):
+    """Column version of format_date / format_date_aest ("09-Feb").
+
+    Parses the whole column with one pd.to_datetime call; anything it can't
+    parse (missing, odd formats) goes through the scalar helper instead.
     """
-    Get players and staff for a specific club, optionally filtered by competition.
-    Merges players_summary.json and staff_summary.json for the structured club view.
-    """
-    def normalize(p, is_staff=False):
-        out = dict(p)
-        if not out.get("team_name") and out.get("teams"):
-            out["team_name"] = out["teams"][0] if out["teams"] else ""
-        if not out.get("league_name") and out.get("leagues"):
-            out["league_name"] = out["leagues"][0] if out["leagues"] else ""
-        if not out.get("role"):
-            roles     = out.get("roles", [])
-            role_slug = out.get("role_slug", "")
-            out["role"] = (roles[0] if roles else (role_slug or "staff")) if is_staff else "player"
-        if is_staff and "jersey" not in out:
-            out["jersey"] = ""
-        return out
-
-    result = []
-    seen_ids = set()
-
-    for p in players_data.get("players", []):
-        pn = normalize(p, False)
-        for team, league in _person_teams_and_leagues(pn):
-            if not team:
-                continue
-            if base_club_name(team) != club_name:
-                continue
-            if competition and extract_competition_from_league_name(league or pn.get("league_name", "")) != competition:
-                continue
-            pid = pn.get("person_id") or f"{pn.get('first_name','')}_{pn.get('last_name','')}"
-            if pid not in seen_ids:
-                seen_ids.add(pid)
-                result.append(pn)
-            break
-
-    if staff_data:
-        for p in staff_data.get("staff", []):
-            pn = normalize(p, True)
-            for team, league in _person_teams_and_leagues(pn):
-                if not team:
-                    continue
-                if base_club_name(team) != club_name:
-                    continue
-                if competition and extract_competition_from_league_name(league or pn.get("league_name", "")) != competition:
-                    continue
-                pid = pn.get("person_id") or f"{pn.get('first_name','')}_{pn.get('last_name','')}"
-                if pid not in seen_ids:
-                    seen_ids.add(pid)
-                    result.append(pn)
-                break
-
-    return result
+    raw = pd.Series(list(date_strs), dtype="object")
+    if aest:
+        parsed = pd.to_datetime(raw, utc=True, errors="coerce", format="ISO8601")
+        parsed = parsed.dt.tz_convert("Australia/Melbourne")
+    else:
+        parsed = pd.to_datetime(raw.str.split("T").str[0], errors="coerce", format="ISO8601")
+    out = parsed.dt.strftime("%d-%b").astype("object")
+    missing = out.isna()
+    if missing.any():
+        fmt_one = format_date_aest if aest else format_date
+        out[missing] = [fmt_one(d) for d in raw[missing]]
+    return out.tolist()
 
 def get_matches_for_player(player):
     return player.get("matches", [])
 
+def _matches_by_id(player):
+    """{match_hash_id: match} for a player, first entry winning like a linear scan."""
+    index = player.get("_matches_by_id")
+    if index is None:
+        index = {}
+        for m in player.get("matches", []):
+            mid = m.get("match_hash_id")
+            if mid and mid not in index:
+                index[mid] = m
+    return index
+
+_EVENT_SLOTS = {"goal": 0, "yellow_card": 1, "red_card": 2}
+
+def _match_event_counts(player):
+    """{match_hash_id: (goals, yellows, reds)} for the matches in _matches_by_id that have events."""
+    counts = player.get("_match_events")
+    if counts is None:
+        counts = {}
+        for mid, m in _matches_by_id(player).items():
+            events = m.get("events")
+            if not events:
+                continue
+            tally = [0, 0, 0]
+            for e in events:
+                slot = _EVENT_SLOTS.get((e.get("type") or e.get("event_type") or "").lower())
+                if slot is not None:
+                    tally[slot] += 1
+            counts[mid] = tuple(tally)
+    return counts
+
 def player_played_in_match(player, match_hash_id):
-    for m in player.get("matches", []):
-        if m.get("match_hash_id") == match_hash_id:
-            return True
-    return False
+    return match_hash_id in _matches_by_id(player)
     
 def get_player_match_stats(player, match_hash_id):
     """Get stats for a specific match"""
-    for m in player.get("matches", []):
-        if m.get("match_hash_id") == match_hash_id:
-            return m
-    return None
- 
+    return _matches_by_id(player).get(match_hash_id)
+
+# Ladder/overview tables: short ones size to their rows, longer ones scroll
+# at a fixed height, and anything past MAX_TABLE_ROWS isn't sent at all.
+MAX_TABLE_ROWS = 500
+TABLE_SCROLL_HEIGHT = 598   # ~16 rows
+
+# Column configs for the league → club navigation tables. st.dataframe
+# deep-copies the mapping it is given, so these can be shared across reruns.
+OVERALL_LADDER_COLUMN_CONFIG = {
+    "Rank": st.column_config.NumberColumn("Rank", width="small"),
+    "Club": st.column_config.TextColumn("Club", width="large"),
+    "P": st.column_config.NumberColumn("P", width="small"),
+    "W": st.column_config.NumberColumn("W", width="small"),
+    "D": st.column_config.NumberColumn("D", width="small"),
+    "L": st.column_config.NumberColumn("L", width="small"),
+    "GF": st.column_config.NumberColumn("GF", width="small"),
+    "GA": st.column_config.NumberColumn("GA", width="small"),
+    "GD": st.column_config.NumberColumn("GD", width="small"),
+    "Pts": st.column_config.NumberColumn("Pts", width="small"),
+}
+
+OVERVIEW_COLUMN_CONFIG = {
+    "Rank": st.column_config.NumberColumn("Rank", width="small"),
+    "Club": st.column_config.TextColumn("Club", width="large"),
+    "Points": st.column_config.NumberColumn("Pts", width="small"),
+    "GF": st.column_config.NumberColumn("GF", width="small"),
+    "GA": st.column_config.NumberColumn("GA", width="small"),
+    "GD": st.column_config.NumberColumn("GD", width="small"),
+}
+
+MATCHES_COLUMN_CONFIG = {
+    "Date": st.column_config.DateColumn("Date", format="ddd, DD-MMM", width="medium"),
+    "H/A": st.column_config.TextColumn("", width="small"),
+    "Opponent": st.column_config.TextColumn("Opponent", width="medium"),
+    "Score": st.column_config.TextColumn("Score", width="small")
+}
+
+PLAYERS_COLUMN_CONFIG = {
+    "Age":    st.column_config.TextColumn("Age", width="small"),
+    "Player": st.column_config.TextColumn("Player", width="medium"),
+    "#":      st.column_config.TextColumn("#", width="small"),
+    "M":      st.column_config.NumberColumn("M", width="small", help="Matches"),
+    "G":      st.column_config.NumberColumn("G", width="small", help="Goals"),
+    "🟨":     st.column_config.NumberColumn("🟨", width="small"),
+    "🟥":     st.column_config.NumberColumn("🟥", width="small"),
+}
+
+STAFF_COLUMN_CONFIG = {
+    "Name": st.column_config.TextColumn("Name", width="medium"),
+    "Role": st.column_config.TextColumn("Role", width="small"),
+    "🟨": st.column_config.NumberColumn("🟨", width="small"),
+    "🟥": st.column_config.NumberColumn("🟥", width="small")
+}
+
+def show_capped_dataframe(df, **kwargs):
+    """st.dataframe with the row cap and height rule above."""
+    total = len(df)
+    if total > MAX_TABLE_ROWS:
+        df = df.head(MAX_TABLE_ROWS)
+    st.dataframe(
+        df,
+        height="content" if len(df) <= 16 else TABLE_SCROLL_HEIGHT,
+        **kwargs,
+    )
+    if total > MAX_TABLE_ROWS:
+        st.caption(f"Showing the first {MAX_TABLE_ROWS} of {total} rows.")
+
 def style_ladder(df, comp):
     """Apply promotion/relegation zone colours based on competition."""
     n = len(df)
@@ -1045,157 +1080,262 @@ def style_ladder(df, comp):
     )
 
  
-def compute_ladder_from_results(results_for_comp):
-    table = defaultdict(lambda: {
-        "club": "",
-        "played": 0,
-        "wins": 0,
-        "draws": 0,
-        "losses": 0,
-        "gf": 0,
-        "ga": 0,
-        "gd": 0,
-        "points": 0,
-    })
+def _score_columns(results):
+    """home/away team names and scores as arrays, plus a "scored" mask.
 
-    for item in results_for_comp:
-        attrs = item.get("attributes", {})
-        home = attrs.get("home_team_name")
-        away = attrs.get("away_team_name")
-        hs = attrs.get("home_score")
-        as_ = attrs.get("away_score")
+    Scores are cast in bulk (NaN where missing or non-numeric) and "scored"
+    marks the rows with both teams and both scores, so the ladder code needs
+    no per-row int() / try-except.
+    """
+    attrs = [item.get("attributes", {}) for item in results]
+    home = np.array([a.get("home_team_name") for a in attrs], dtype=object)
+    away = np.array([a.get("away_team_name") for a in attrs], dtype=object)
+    hs = pd.to_numeric(pd.Series([a.get("home_score") for a in attrs], dtype=object),
+                       errors="coerce").to_numpy(dtype=float)
+    as_ = pd.to_numeric(pd.Series([a.get("away_score") for a in attrs], dtype=object),
+                        errors="coerce").to_numpy(dtype=float)
+    scored = (home != None) & (away != None) & ~np.isnan(hs) & ~np.isnan(as_)
+    return {"home": home, "away": away, "hs": hs, "as": as_, "scored": scored}
+
+def _ladder_table(home, away, hs, as_):
+    """Per-club played/W/D/L/GF/GA/GD/points from per-match arrays, unsorted."""
+    hs = np.asarray(hs).astype(np.int64)
+    as_ = np.asarray(as_).astype(np.int64)
+    home_win = hs > as_
+    away_win = hs < as_
+    draw = hs == as_
+
+    # One slot per team per match, home then away, so factorize() numbers
+    # clubs in first-appearance order — exact ties keep the old dict order
+    def _interleave(h, a):
+        return np.column_stack((h, a)).ravel()
+
+    codes, clubs = pd.factorize(_interleave(np.asarray(home, dtype=object),
+                                            np.asarray(away, dtype=object)))
+    n_clubs = len(clubs)
+
+    def _tally(values):
+        return np.bincount(codes, weights=values, minlength=n_clubs).astype(np.int64)
+
+    table = pd.DataFrame({
+        "club": clubs,
+        "played": np.bincount(codes, minlength=n_clubs),
+        "wins": _tally(_interleave(home_win, away_win)),
+        "draws": _tally(np.repeat(draw, 2)),
+        "losses": _tally(_interleave(away_win, home_win)),
+        "gf": _tally(_interleave(hs, as_)),
+        "ga": _tally(_interleave(as_, hs)),
+    })
+    table["gd"] = table["gf"] - table["ga"]
+    table["points"] = 3 * table["wins"] + table["draws"]
+    return table
+
+def _ranked_ladder(home, away, hs, as_, tiebreak_ga=True):
+    """Ladder table sorted by points, GD, GF (then GA if tiebreak_ga), then club name."""
+    table = _ladder_table(home, away, hs, as_)
+    table["_club_key"] = table["club"].str.lower()
+    by = ["points", "gd", "gf"] + (["ga"] if tiebreak_ga else []) + ["_club_key"]
+    table = table.sort_values(
+        by,
+        ascending=[False, False, False] + ([True] if tiebreak_ga else []) + [True],
+        kind="stable",
+        ignore_index=True,
+    )
+    return table[["club", "played", "wins", "draws", "losses", "gf", "ga", "gd", "points"]]
 
-        if home is None or away is None or hs is None or as_ is None:
-            continue
+def _ladder_records(home, away, hs, as_, tiebreak_ga=True):
+    if not len(home):
+        return []
+    return _ranked_ladder(home, away, hs, as_, tiebreak_ga).to_dict("records")
 
+# ---------------------------------------------------------
+# Cached views over results/fixtures
+# ---------------------------------------------------------
+# The results/fixtures lists are too big to hash on every call, so the
+# wrappers take them as underscore args (skipped by st.cache_data) and key
+# on the data files' mtimes instead.
+
+def _file_mtimes(*names):
+    """mtimes of data files — change whenever the pipeline rewrites them."""
+    version = []
+    for name in names:
         try:
-            hs = int(hs)
-            as_ = int(as_)
-        except Exception:
-            continue
-
-        for team in [home, away]:
-            if table[team]["club"] == "":
-                table[team]["club"] = team
-
-        table[home]["played"] += 1
-        table[away]["played"] += 1
-        table[home]["gf"] += hs
-        table[home]["ga"] += as_
-        table[away]["gf"] += as_
-        table[away]["ga"] += hs
-
-        if hs > as_:
-            table[home]["wins"] += 1
-            table[away]["losses"] += 1
-            table[home]["points"] += 3
-        elif hs < as_:
-            table[away]["wins"] += 1
-            table[home]["losses"] += 1
-            table[away]["points"] += 3
-        else:
-            table[home]["draws"] += 1
-            table[away]["draws"] += 1
-            table[home]["points"] += 1
-            table[away]["points"] += 1
-
-    for team, row in table.items():
-        row["gd"] = row["gf"] - row["ga"]
-
-    ladder = sorted(
-        table.values(),
-        key=lambda r: (
-            -r["points"],
-            -r["gd"],
-            -r["gf"],
-            r["ga"],
-            r["club"].lower(),
-        )
-    )
-    return ladder
+            version.append(os.path.getmtime(os.path.join(DATA_DIR, name)))
+        except OSError:
+            version.append(0.0)
+    return tuple(version)
+
+# The navigation lists are read on every rerun; cache_resource hands back the
+# same (immutable) tuples instead of unpickling a fresh copy each time.
+@st.cache_resource(ttl=900, max_entries=2, show_spinner=False)
+def cached_all_leagues(version, _results, _fixtures):
+    return tuple(get_all_leagues(_results, _fixtures))
+
+@st.cache_resource(ttl=900, max_entries=2, show_spinner=False)
+def league_competition_index(version, _results, _fixtures):
+    """{league: sorted competitions} — get_competitions_for_league for every league in one pass."""
+    index = defaultdict(set)
+    for item in chain(_results, _fixtures):
+        league_name = item.get("attributes", {}).get("league_name")
+        if league_name:
+            index[extract_league_from_league_name(league_name)].add(
+                extract_competition_from_league_name(league_name))
+    return {league: tuple(sorted(comps)) for league, comps in index.items()}
+
+def cached_competitions_for_league(version, league, _results, _fixtures):
+    return league_competition_index(version, _results, _fixtures).get(league, ())
+
+@st.cache_resource(ttl=900, max_entries=2, show_spinner=False)
+def results_columns(version, _results):
+    """Column view of the results (one NumPy array per field, row-aligned with _results)."""
+    attrs = [item.get("attributes", {}) for item in _results]
+    league = [a.get("league_name") for a in attrs]
+    cols = _score_columns(_results)
+    cols.update({
+        "complete": np.fromiter((a.get("status") == "complete" for a in attrs),
+                                dtype=bool, count=len(attrs)),
+        "comp": np.array([extract_competition_from_league_name(l) if l else None
+                          for l in league], dtype=object),
+        "league": np.array([extract_league_from_league_name(l) if l else None
+                            for l in league], dtype=object),
+        "home_base": np.array([base_club_name(h) for h in cols["home"]], dtype=object),
+        "away_base": np.array([base_club_name(a) for a in cols["away"]], dtype=object),
+    })
+    return cols
+
+@st.cache_data(ttl=900, show_spinner=False)
+def cached_ladder_table(version, competition, _results):
+    """The competition ladder as its display table (Pos, Club, P, W, ...); empty if no results."""
+    cols = results_columns(version, _results)
+    ok = np.flatnonzero(cols["complete"] & cols["scored"] & (cols["comp"] == competition))
+    if not len(ok):
+        return pd.DataFrame()
+    # Straight from the sorted tally — no records list / DataFrame round trip
+    ladder_df = _ranked_ladder(cols["home"][ok], cols["away"][ok], cols["hs"][ok], cols["as"][ok])
+    # Build display dataframe in one go (no insert / column add / rename copies)
+    return pd.DataFrame({
+        "Pos": np.arange(1, len(ladder_df) + 1),
+        "Club": base_club_name_series(ladder_df["club"]),
+        "P": ladder_df["played"], "W": ladder_df["wins"], "D": ladder_df["draws"],
+        "L": ladder_df["losses"], "GF": ladder_df["gf"], "GA": ladder_df["ga"],
+        "GD": ladder_df["gd"], "Pts": ladder_df["points"],
+    })
 
-def compute_overall_points_ladder(results, league):
+@st.cache_data(ttl=900, show_spinner=False)
+def cached_overall_points_ladder(version, league, _results):
     """
     Overall ladder based on actual match POINTS (W=3, D=1, L=0) summed
     across ALL age groups in a league. Uses base club name to merge teams.
     """
-    table = defaultdict(lambda: {
-        "club": "",
-        "played": 0,
-        "wins": 0,
-        "draws": 0,
-        "losses": 0,
-        "gf": 0,
-        "ga": 0,
-        "gd": 0,
-        "points": 0,
+    cols = results_columns(version, _results)
+    ok = np.flatnonzero(cols["complete"] & cols["scored"] & (cols["league"] == league))
+    return _ladder_records(cols["home_base"][ok], cols["away_base"][ok],
+                           cols["hs"][ok], cols["as"][ok], tiebreak_ga=False)
+
+@st.cache_resource(ttl=900, max_entries=2, show_spinner=False)
+def club_match_index(version, _results):
+    """{(competition, base club): [completed results]} — each result listed under both of its clubs."""
+    cols = results_columns(version, _results)
+    rows = np.flatnonzero(cols["complete"] & (cols["comp"] != None))
+    # Each result is filed under its home club and, if different, its away club
+    away_rows = rows[cols["away_base"][rows] != cols["home_base"][rows]]
+    keys = pd.DataFrame({
+        "comp": np.concatenate([cols["comp"][rows], cols["comp"][away_rows]]),
+        "club": np.concatenate([cols["home_base"][rows], cols["away_base"][away_rows]]),
+        "row": np.concatenate([rows, away_rows]),
+    }).sort_values("row", kind="stable")
+    return {key: [_results[i] for i in group]
+            for key, group in keys.groupby(["comp", "club"], sort=False)["row"]}
+
+@st.cache_resource(ttl=900, max_entries=2, show_spinner=False)
+def club_squad_index(version, _players_data, _staff_data):
+    """{(base club, competition): [people]} — normalised players then staff, each person once per key."""
+    index = defaultdict(list)
+    seen = defaultdict(set)
+    people = [(p, False) for p in _players_data.get("players", [])]
+    if _staff_data:
+        people += [(p, True) for p in _staff_data.get("staff", [])]
+    for p, is_staff in people:
+        pn = _normalize_person(p, is_staff)
+        pid = pn.get("person_id") or f"{pn.get('first_name','')}_{pn.get('last_name','')}"
+        for team, league in _person_teams_and_leagues(pn):
+            if not team:
+                continue
+            key = (base_club_name(team),
+                   extract_competition_from_league_name(league or pn.get("league_name", "")))
+            if pid not in seen[key]:
+                seen[key].add(pid)
+                index[key].append(pn)
+    return dict(index)
+
+@st.cache_resource(ttl=900, max_entries=64, show_spinner=False)
+def squad_season_table(version, club, comp, _players_data, _staff_data):
+    """(players, season table) for a club's squad in a competition.
+
+    The table is row-aligned with players: Age, Player, #, M, G, 🟨, 🟥 as
+    shown without a match selected, plus _name/_badge to rebuild Player
+    for a single match.
+    """
+    people = club_squad_index(version, _players_data, _staff_data).get((club, comp), [])
+    players = [p for p in people if not p.get("role") or p["role"].lower() == "player"]
+    ages, names, badges, jerseys, played, goals, yellows, reds = [], [], [], [], [], [], [], []
+    for p in players:
+        reg = get_player_reg_info(p, club, comp)
+        p_stats = p.get("stats") or {}
+        ages.append(reg["age"])
+        names.append(f"{p.get('first_name', '')} {p.get('last_name', '')}")
+        badges.append(reg["badge"])
+        jerseys.append(p.get("jerseys", {}).get(
+            next((t for t in p.get("teams", []) if base_club_name(t) == club), ""),
+            p.get("jersey", "")
+        ))
+        played.append(sum(1 for m in p.get("matches", [])
+                          if m.get("available", False) or m.get("started", False)))
+        goals.append(p_stats.get("goals", 0))
+        yellows.append(p_stats.get("yellow_cards", 0))
+        reds.append(p_stats.get("red_cards", 0))
+    table = pd.DataFrame({
+        "Age": ages,
+        "Player": [n + b for n, b in zip(names, badges)], "#": jerseys,
+        "M": played, "G": goals, "🟨": yellows, "🟥": reds,
+        "_name": names, "_badge": badges,
     })
-
-    for item in results:
-        attrs = item.get("attributes", {})
-        league_name = attrs.get("league_name", "")
-        if not league_name:
-            continue
-        if extract_league_from_league_name(league_name) != league:
-            continue
-        if attrs.get("status") != "complete":
-            continue
-
-        home = attrs.get("home_team_name")
-        away = attrs.get("away_team_name")
-        hs = attrs.get("home_score")
-        as_ = attrs.get("away_score")
-
-        if home is None or away is None or hs is None or as_ is None:
-            continue
-
-        try:
-            hs = int(hs)
-            as_ = int(as_)
-        except Exception:
-            continue
-
-        home_base = base_club_name(home)
-        away_base = base_club_name(away)
-
-        for team_base in [home_base, away_base]:
-            if table[team_base]["club"] == "":
-                table[team_base]["club"] = team_base
-
-        table[home_base]["played"] += 1
-        table[away_base]["played"] += 1
-        table[home_base]["gf"] += hs
-        table[home_base]["ga"] += as_
-        table[away_base]["gf"] += as_
-        table[away_base]["ga"] += hs
-
-        if hs > as_:
-            table[home_base]["wins"] += 1
-            table[away_base]["losses"] += 1
-            table[home_base]["points"] += 3
-        elif hs < as_:
-            table[away_base]["wins"] += 1
-            table[home_base]["losses"] += 1
-            table[away_base]["points"] += 3
-        else:
-            table[home_base]["draws"] += 1
-            table[away_base]["draws"] += 1
-            table[home_base]["points"] += 1
-            table[away_base]["points"] += 1
-
-    for team, row in table.items():
-        row["gd"] = row["gf"] - row["ga"]
-
-    ladder = sorted(
-        table.values(),
-        key=lambda r: (
-            -r["points"],
-            -r["gd"],
-            -r["gf"],
-            r["club"].lower(),
-        ),
-    )
-    return ladder
+    return players, table
+
+@st.cache_resource(ttl=900, max_entries=2, show_spinner=False)
+def people_index(version):
+    """Profile-picker data: (people, display strings, {display: person}, {player_id: position}, login options)."""
+    people = get_players_and_coaches_list(DATA_DIR)
+    displays = [format_player_display(p) for p in people]
+    by_display = {}
+    id_pos = {}
+    # setdefault keeps the first match, as the old linear scans did
+    for i, (p, display) in enumerate(zip(people, displays)):
+        by_display.setdefault(display, p)
+        id_pos.setdefault(p.get("player_id"), i)
+    return people, displays, by_display, id_pos, [""] + displays
+
+def _people_version():
+    return _file_mtimes("players_summary.json", "staff_summary.json")
+
+@st.cache_data(ttl=900, show_spinner=False)
+def cached_overview_table(version, league, _comp_overview):
+    """Flatten competition_overview[league] into the old position-ladder table."""
+    data = _comp_overview[league]
+    clubs = data.get("clubs", [])
+    club_ages = [club.get("age_groups", {}) for club in clubs]
+    overview_cols = {
+        "Rank":   [club.get("overall_rank", 0) for club in clubs],
+        "Club":   [base_club_name(club.get("club", "")) for club in clubs],
+        "Points": [club.get("total_position_points", 0) for club in clubs],
+    }
+    for age in data.get("age_groups", []):
+        overview_cols[age] = [ca.get(age, {}).get("position") or "-" for ca in club_ages]
+    overview_cols["GF"] = [club.get("total_gf", 0) for club in clubs]
+    overview_cols["GA"] = [club.get("total_ga", 0) for club in clubs]
+    df_overview = pd.DataFrame(overview_cols)
+    df_overview["GD"] = df_overview["GF"] - df_overview["GA"]
+    return df_overview
 
 def restart_to_top():
     st.session_state["level"] = "league"
@@ -1223,75 +1363,145 @@ def back_one_level():
 # Header with user info
 # ---------------------------------------------------------
 
-def header():
-    """Renders the full-width app header and last updated timestamp"""
-    last_updated = get_last_updated_time()
-    # Main Title and Subtitle
-    st.markdown(f"""
+_HEADER_HTML = """
         <div class="main-header" style="text-align: center; position: relative;">
             <h3 style='margin:0; padding:0;'>⚽ Junior Pro Football Intelligence</h3>
             <p style='margin:0.5rem 0 0 0; font-size:16px; opacity:0.9;'>
-                {st.session_state.get('player_club') or 'League'} 
-                → {st.session_state.get('player_age_group') or 'Competition'} 
+                {club} 
+                → {age_group} 
                 → Players
             </p>
             <span style="font-size: 12px; color: #000000; text-transform: uppercase; letter-spacing: 1px;">
                     📅 Data Updated: {last_updated}
                 </span>
         </div>
-    """, unsafe_allow_html=True)
+    """
 
+_ADMIN_BADGE_HTML = """
+                <div class="user-badge">
+                    🔑 Admin: {full_name}
+                </div>
+            """
 
+def header():
+    """Renders the full-width app header and last updated timestamp"""
+    # Main Title and Subtitle — only the club, age group and timestamp vary
+    st.markdown(_HEADER_HTML.format(
+        club=st.session_state.get('player_club') or 'League',
+        age_group=st.session_state.get('player_age_group') or 'Competition',
+        last_updated=get_last_updated_time(),
+    ), unsafe_allow_html=True)
+
+
+_NL_KEYWORDS = (
+    "stats for", "when", "where", "how many", "what", "who",
+    "next match", "last match", "results for", "goals", "cards",
+    "when do i play", "my next", "upcoming", "schedule", "fixture",
+    "details for", "top scorer", "ladder", "table", "form",
+    "yellow card", "red card", "lineup", "vs", " v ",
+    "team", "overview", "competition", "standings", "rankings",
+    "ypl1", "ypl2", "ysl", "overdue",
+    "coach", "coaches", "staff", "manager", "managers",
+    "today", "todays", "result", "cards this week", "all cards",
+    "latest results", "latest result", "recent results",
+    "missing score", "missing scores", "overdue", "no score",
+    "latest missing", "scores not entered",
+    # Squad / player list queries
+    "show me", "players for", "players in", "list players",
+    "squad", "who plays", "players at",
+    # Dual registration — all variants
+    "dual", "cross club", "different club", "multiple club",
+    "2 clubs", "2 teams", "two clubs", "two teams",
+    "playing for 2", "playing for two", "2 or more",
+    "registered in 2", "registered at 2",
+    "dual matches", "matches both teams", "matches each team",
+    "breakdown", " vs ", " v ",
+    # Appearances / scorers
+    "most appearances", "most matches", "most games", "appearances",
+    "games played", "matches played", "top scorers", "golden boot",
+    "leading scorer",
+    # Match detail triggers
+    "match detail", "match details", "game detail", "lineups for",
+    "stats for", "details",
+    "total cards", "card summary", "cards by", "cards per", "cards each",
+    "cards per club", "card per club",
+    "own goal", "own goals",
+    # Season summary
+    "season summary", "season", "full season",
+    "results and fixtures", "fixtures and results",
+    "all matches", "all results", "all fixtures",
+    # Predicted ladder and match prediction (admin example buttons only, but queries work for all)
+    "predicted ladder", "predict ladder", "ladder after",
+    "predicted standings", "end of season ladder", "projected ladder",
+    "where will i finish", "final ladder",
+    "predict", "prediction", "score prediction", "preview",
+)
+# One alternation over all keywords (longest first); a match anywhere is the
+# same test as `any(keyword in query.lower() ...)`, but done in a single C scan.
+_NL_RE = re.compile("|".join(re.escape(k) for k in sorted(set(_NL_KEYWORDS), key=len, reverse=True)))
+
+@lru_cache(maxsize=256)
 def is_natural_language_query(query):
-    keywords = [
-        "stats for", "when", "where", "how many", "what", "who",
-        "next match", "last match", "results for", "goals", "cards",
-        "when do i play", "my next", "upcoming", "schedule", "fixture",
-        "details for", "top scorer", "ladder", "table", "form",
-        "yellow card", "red card", "lineup", "vs", " v ",
-        "team", "overview", "competition", "standings", "rankings",
-        "ypl1", "ypl2", "ysl", "overdue",
-        "coach", "coaches", "staff", "manager", "managers",
-        "today", "todays", "result", "cards this week", "all cards",
-        "latest results", "latest result", "recent results",
-        "missing score", "missing scores", "overdue", "no score",
-        "latest missing", "scores not entered",
-        # Squad / player list queries
-        "show me", "players for", "players in", "list players",
-        "squad", "who plays", "players at",
-        # Dual registration — all variants
-        "dual", "cross club", "different club", "multiple club",
-        "2 clubs", "2 teams", "two clubs", "two teams",
-        "playing for 2", "playing for two", "2 or more",
-        "registered in 2", "registered at 2",
-        "dual matches", "matches both teams", "matches each team",
-        "breakdown", " vs ", " v ",
-        # Appearances / scorers
-        "most appearances", "most matches", "most games", "appearances",
-        "games played", "matches played", "top scorers", "golden boot",
-        "leading scorer",
-        # Match detail triggers
-        "match detail", "match details", "game detail", "lineups for",
-        "stats for", "details",
-        "total cards", "card summary", "cards by", "cards per", "cards each",
-        "cards per club", "card per club",
-        "own goal", "own goals",
-        # Season summary
-        "season summary", "season", "full season",
-        "results and fixtures", "fixtures and results",
-        "all matches", "all results", "all fixtures",
-        # Predicted ladder and match prediction (admin example buttons only, but queries work for all)
-        "predicted ladder", "predict ladder", "ladder after",
-        "predicted standings", "end of season ladder", "projected ladder",
-        "where will i finish", "final ladder",
-        "predict", "prediction", "score prediction", "preview",
-    ]
-    return any(keyword in query.lower() for keyword in keywords)
+    return _NL_RE.search(query.lower()) is not None
 
 # ---------------------------------------------------------
 # Admin Dashboard
 # ---------------------------------------------------------
 
+@st.cache_data(ttl=60, show_spinner=False)
+def admin_active_today():
+    """(today's active users, formatting error) with last_activity shown in AEST; (None, None) if nobody."""
+    active_today = get_active_users_today()
+    if not active_today:
+        return None, None
+    df_active = pd.DataFrame(active_today)
+    error = None
+    
+    # --- Convert last_activity column to AEST ---
+    if 'last_activity' in df_active.columns:
+        try:
+            # Convert strings to datetime objects (assuming UTC), then to Melbourne time
+            last = pd.to_datetime(df_active['last_activity'], utc=True).dt.tz_convert(MELBOURNE_TZ)
+            # Format: Mon, 16-Feb 14:30:05
+            df_active['last_activity'] = last.dt.strftime("%a, %d-%b %H:%M:%S")
+        except Exception as e:
+            error = f"Error formatting last_activity: {e}"
+    return df_active, error
+
+@st.cache_data(ttl=60, show_spinner=False)
+def admin_ip_views(limit=1000):
+    """IP-tracking tables for the admin dashboard.
+
+    None when there is no activity, {} when no IP addresses have been
+    logged yet. Cached so switching dashboard tabs doesn't rebuild them.
+    """
+    recent = get_recent_activity(limit=limit)
+    if not recent:
+        return None
+    df = pd.DataFrame(recent)
+    if 'ip_address' not in df.columns or df['ip_address'].isna().all():
+        return {}
+
+    # Filter out Unknown/None IPs
+    df_valid_ip = df[df['ip_address'].notna() & (df['ip_address'] != 'Unknown')]
+
+    # Top IPs by activity
+    ip_counts = df_valid_ip['ip_address'].value_counts().head(10).reset_index()
+    ip_counts.columns = ['IP Address', 'Activities']
+
+    logins = df[df['action_type'] == 'login'][['timestamp', 'username', 'full_name', 'ip_address']].head(20)
+
+    # Show which users use which IPs
+    user_ip_map = df_valid_ip.groupby(['username', 'ip_address']).size().reset_index(name='count')
+    user_ip_map = user_ip_map.sort_values('count', ascending=False).head(20)
+
+    return {
+        "unique_ips": df_valid_ip['ip_address'].nunique(),
+        "ip_counts": ip_counts,
+        "logins": logins,
+        "user_ip_map": user_ip_map,
+    }
+
 def show_admin_dashboard():
     """Display admin dashboard with activity analytics"""
     st.markdown("## 📊 Admin Dashboard")
@@ -1301,20 +1511,12 @@ def show_admin_dashboard():
     with col_r1:
         if st.button("🔄 Force Refresh Data", width='content'):
             try:
-                from fast_agent import _load_all_data, _refresh_data
-                _load_all_data.clear()
-                _refresh_data()
+                router.reload_data()
                 st.success("✅ Data reloaded from disk!")
             except Exception as e:
                 st.error(f"Refresh failed: {e}")
     with col_r2:
-        try:
-            from fast_agent import _load_all_data
-            import inspect
-            # Show when cache was last populated (approximate)
-            st.caption("Cache refreshes every 5 min automatically")
-        except Exception:
-            pass
+        st.caption("Cache refreshes when data files change")
 
     st.markdown("---")
     # Tabs for different views
@@ -1331,8 +1533,8 @@ def show_admin_dashboard():
         with col2:
             st.metric("Unique Users", stats.get('unique_users', 0))
         with col3:
-            active_today = get_active_users_today()
-            st.metric("Active Today", len(active_today))
+            df_active, _ = admin_active_today()
+            st.metric("Active Today", 0 if df_active is None else len(df_active))
         with col4:
             search_count = stats.get('activities_by_type', {}).get('search_query', 0)
             st.metric("Total Searches", search_count)
@@ -1367,22 +1569,10 @@ def show_admin_dashboard():
     with tab2:
         # Active users today
         st.markdown("### Active Users Today")
-        active_today = get_active_users_today()
-        if active_today:
-            df_active = pd.DataFrame(active_today)
-            
-            # --- Convert last_activity column to AEST ---
-            if 'last_activity' in df_active.columns:
-                try:
-                    aest = pytz.timezone('Australia/Melbourne')
-                    # Convert strings to datetime objects (assuming UTC)
-                    df_active['last_activity'] = pd.to_datetime(df_active['last_activity'], utc=True)
-                    # Convert to Melbourne time
-                    df_active['last_activity'] = df_active['last_activity'].dt.tz_convert(aest)
-                    # Format: Mon, 16-Feb 14:30:05
-                    df_active['last_activity'] = df_active['last_activity'].dt.strftime("%a, %d-%b %H:%M:%S")
-                except Exception as e:
-                    st.error(f"Error formatting last_activity: {e}")
+        df_active, active_error = admin_active_today()
+        if df_active is not None:
+            if active_error:
+                st.error(active_error)
             
             st.dataframe(df_active, hide_index=True, width='content')
         else:
@@ -1416,37 +1606,24 @@ def show_admin_dashboard():
     with tab4:
         st.markdown("### 🌐 IP Address Analytics")
         
-        recent = get_recent_activity(limit=1000)
-        if recent:
-            df = pd.DataFrame(recent)
-            
-            if 'ip_address' in df.columns and not df['ip_address'].isna().all():
-                # Filter out Unknown/None IPs
-                df_valid_ip = df[df['ip_address'].notna() & (df['ip_address'] != 'Unknown')]
-                
+        ip_views = admin_ip_views()
+        if ip_views is not None:
+            if ip_views:
                 col1, col2 = st.columns(2)
                 
                 with col1:
                     st.markdown("#### 📊 IP Statistics")
-                    unique_ips = df_valid_ip['ip_address'].nunique()
-                    st.metric("Unique IP Addresses", unique_ips)
+                    st.metric("Unique IP Addresses", ip_views["unique_ips"])
                     
-                    # Top IPs by activity
                     st.markdown("**Most Active IPs**")
-                    ip_counts = df_valid_ip['ip_address'].value_counts().head(10).reset_index()
-                    ip_counts.columns = ['IP Address', 'Activities']
-                    st.dataframe(ip_counts, hide_index=True, width='content')
+                    st.dataframe(ip_views["ip_counts"], hide_index=True, width='content')
                 
                 with col2:
                     st.markdown("#### 🔐 Recent Logins by IP")
-                    logins = df[df['action_type'] == 'login'][['timestamp', 'username', 'full_name', 'ip_address']].head(20)
-                    st.dataframe(logins, hide_index=True, width='content')
+                    st.dataframe(ip_views["logins"], hide_index=True, width='content')
                     
                     st.markdown("#### 🔍 IP to User Mapping")
-                    # Show which users use which IPs
-                    user_ip_map = df_valid_ip.groupby(['username', 'ip_address']).size().reset_index(name='count')
-                    user_ip_map = user_ip_map.sort_values('count', ascending=False).head(20)
-                    st.dataframe(user_ip_map, hide_index=True, width='content')
+                    st.dataframe(ip_views["user_ip_map"], hide_index=True, width='content')
             else:
                 st.info("No IP address data available yet. IP tracking will start with the next login.")
         else:
@@ -1532,7 +1709,7 @@ def show_admin_dashboard():
                         _fire_query = lambda q: (
                             st.session_state.update({"clicked_query": q,
                                 "show_admin_dashboard": False,
-                                "expander_collapse_counter": st.session_state.get("expander_collapse_counter",0)+1})
+                                "expander_collapse_counter": st.session_state["expander_collapse_counter"] + 1})
                             or st.rerun()
                         )
                         st.session_state["clicked_query"] = (
@@ -1665,13 +1842,32 @@ def update_user_config(club_name: str, age_group: str):
         
     except Exception as e:
         print(f"Error updating USER_CONFIG: {e}")
+def _person_league(p):
+    """(full league name, competition code) recorded for a player/staff entry."""
+    # Get full league name - try multiple fields
+    league = (p.get('league_name') or 
+             (p.get('leagues', [None])[0] if p.get('leagues') else None) or
+             p.get('competition_name') or
+             '')
+    
+    # Extract just the competition part (YPL1, YPL2, etc.)
+    return league, extract_competition_from_league(league)
+
+@st.cache_resource(ttl=900, max_entries=2, show_spinner=False)
+def person_league_index(version):
+    """{(first lower, last lower): (league, competition)} — players first, then staff; first entry wins."""
+    index = {}
+    players_data = load_players_summary(_file_mtimes("players_summary.json"))
+    staff_data = load_staff_summary(_file_mtimes("staff_summary.json"))
+    for p in chain(players_data.get("players", []), staff_data.get("staff", [])):
+        key = ((p.get('first_name') or '').lower(), (p.get('last_name') or '').lower())
+        if key not in index:
+            index[key] = _person_league(p)
+    return index
+
 def get_player_league_info(player_name: str, club: str, age_group: str):
     """Look up player's league and competition from loaded data"""
     try:
-        # Load player data
-        players_data = load_players_summary()
-        players = players_data.get("players", [])
-        
         # Split name
         name_parts = player_name.split()
         if len(name_parts) >= 2:
@@ -1681,40 +1877,9 @@ def get_player_league_info(player_name: str, club: str, age_group: str):
             first_name = player_name
             last_name = ""
         
-        # Find matching player
-        for p in players:
-            if (p.get('first_name', '').lower() == first_name.lower() and 
-                p.get('last_name', '').lower() == last_name.lower()):
-                
-                # Get full league name - try multiple fields
-                league = (p.get('league_name') or 
-                         (p.get('leagues', [None])[0] if p.get('leagues') else None) or
-                         p.get('competition_name') or
-                         '')
-                
-                # Extract just the competition part (YPL1, YPL2, etc.)
-                competition = extract_competition_from_league(league)
-                
-                return league, competition
-        
-        # If not found in players, try staff
-        staff_data = load_staff_summary()
-        staff = staff_data.get("staff", [])
-        
-        for s in staff:
-            if (s.get('first_name', '').lower() == first_name.lower() and 
-                s.get('last_name', '').lower() == last_name.lower()):
-                
-                league = (s.get('league_name') or 
-                         (s.get('leagues', [None])[0] if s.get('leagues') else None) or
-                         s.get('competition_name') or
-                         '')
-                
-                competition = extract_competition_from_league(league)
-                
-                return league, competition
-        # Not found (expected for Guest/anonymous)
-        return '', ''
+        # Players first, then staff; ('', '') when not found (expected for Guest/anonymous)
+        return person_league_index(_people_version()).get(
+            (first_name.lower(), last_name.lower()), ('', ''))
         
     except Exception as e:
         print(f"Error getting league info: {e}")
@@ -1788,8 +1953,7 @@ def _render_ladder_prediction(data: dict):
         st.caption("Based on predicting each remaining match using attack/defence strength model")
         if pred_ladder:
             df = pd.DataFrame(pred_ladder)[["Pos","Team","P","W","D","L","GF","GA","GD","Pts"]]
-            df["Team"] = df["Team"].apply(
-                lambda t: f"▶ {t}" if club_token in t.lower() else t)
+            df["Team"] = mark_club_teams(df["Team"], club_token)
             h = min(600, (len(df) + 1) * 35 + 10)
             st.dataframe(df, hide_index=True, width='content', height=h,
                 column_config={
@@ -1809,8 +1973,7 @@ def _render_ladder_prediction(data: dict):
         st.caption("Based on each team's current points-per-game rate × games remaining")
         if extrap_ladder:
             df_e = pd.DataFrame(extrap_ladder)[["Proj Pos","Team","Current Pts","PPG","Games Left","Projected Pts"]]
-            df_e["Team"] = df_e["Team"].apply(
-                lambda t: f"▶ {t}" if club_token in t.lower() else t)
+            df_e["Team"] = mark_club_teams(df_e["Team"], club_token)
             h = min(600, (len(df_e) + 1) * 35 + 10)
             st.dataframe(df_e, hide_index=True, width='content', height=h,
                 column_config={
@@ -2052,7 +2215,7 @@ def _render_season_summary(data: dict):
         if age_filter:
             if st.button(f"👥 Our Squad", key=f"season_squad_btn_{club}_{age_filter}", width='content'):
                 st.session_state["clicked_query"] = f"squad for {club} {age_filter}"
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
     if not past and not upcoming and not ladder:
@@ -2109,7 +2272,7 @@ def _render_season_summary(data: dict):
                         if st.button(f"📋 {ag} details", key=f"latest_match_btn_{club}_{ag}"):
                             st.session_state["clicked_query"] = f"match details {latest['hash']}"
                             st.session_state["show_season_page"] = False
-                            st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                            st.session_state["expander_collapse_counter"] += 1
                             st.rerun()
         elif latest_match:
             # Single age group — show full detail
@@ -2130,7 +2293,7 @@ def _render_season_summary(data: dict):
                 if st.button("📋 Full match details", key=f"latest_match_btn_{club}"):
                     st.session_state["clicked_query"] = f"match details {latest_match['hash']}"
                     st.session_state["show_season_page"] = False
-                    st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                    st.session_state["expander_collapse_counter"] += 1
                     st.rerun()
         else:
             st.caption("No matches played yet.")
@@ -2195,7 +2358,7 @@ def _render_season_summary(data: dict):
                         st.session_state["clicked_query"] = (
                             f"match details {_row['_home']} vs {_row['_away']} {_row['_iso']}"
                         )
-                    st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                    st.session_state["expander_collapse_counter"] += 1
                     st.session_state["show_season_page"] = False
                     st.rerun()
             else:
@@ -2247,7 +2410,7 @@ def _render_season_summary(data: dict):
             # ── Squad button for this age group ───────────────────────────────
             if st.button(f"👥 View {club} {age_grp} Squad", key=f"squad_btn_{club}_{age_grp}", width='content'):
                 st.session_state["clicked_query"] = f"squad for {club} {age_grp}"
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.session_state["show_season_page"] = False
                 st.rerun()
 
@@ -2260,8 +2423,7 @@ def _render_season_summary(data: dict):
                     club_lower = club.lower()
                     df_lad = pd.DataFrame(ladder_section["table"])
                     df_lad = df_lad.rename(columns={"PTS": "Pts"})
-                    df_lad["Team"] = df_lad["Team"].apply(
-                        lambda t: f"▶ {t}" if club_lower in t.lower() else t)
+                    df_lad["Team"] = mark_club_teams(df_lad["Team"], club_lower)
                     h = min(500, (len(df_lad) + 1) * 35 + 10)
                     st.caption("👇 Click a team to see their season summary")
                     _lad_key = f"season_lad_{age_grp}_{st.session_state.get('expander_collapse_counter',0)}"
@@ -2287,7 +2449,7 @@ def _render_season_summary(data: dict):
                         _team_name = df_lad.iloc[_lr[0]]["Team"].lstrip("▶ ").strip()
                         st.session_state["clicked_query"] = f"season {_team_name} {age_grp}"
                         st.session_state["show_season_page"] = False
-                        st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                        st.session_state["expander_collapse_counter"] += 1
                         st.rerun()
 
             st.markdown("---")
@@ -2341,13 +2503,13 @@ def _render_season_summary(data: dict):
                     with _btn_col1:
                         if st.button(f"📊 Full Match Details", key=f"season_match_det_{age_grp}_{_rr[0]}", width='content'):
                             st.session_state["clicked_query"] = _match_query
-                            st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                            st.session_state["expander_collapse_counter"] += 1
                             st.session_state["show_season_page"] = False
                             st.rerun()
                     with _btn_col2:
                         if _opp and st.button(f"👥 {_opp} Squad", key=f"season_opp_squad_{age_grp}_{_rr[0]}", width='content'):
                             st.session_state["clicked_query"] = f"squad for {_opp} {age_grp}"
-                            st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                            st.session_state["expander_collapse_counter"] += 1
                             st.session_state["show_season_page"] = False
                             st.rerun()
             else:
@@ -2427,15 +2589,86 @@ def show_season_page():
         st.rerun()
 
 
+# ---------------------------------------------------------
+# Example queries (💡 expander in main_app)
+# ---------------------------------------------------------
+# One tuple per column, each a sequence of (heading, buttons).
+# Buttons are (key, label, query); label/query are formatted with the
+# user's club/age/name/competition, the next opponent ({opp}) and the
+# vs-example ({vs_label}/{vs_query}). Buttons mentioning {opp} are hidden
+# when there's no upcoming fixture; _EX_ADMIN_ONLY keys need role=admin.
+
+_EX_PLAYER_STATS = (
+    ("ex1",  "top scorers in {club}",      "top scorers in {club}"),
+    ("ex1b", "most appearances in {club}", "most appearances in {club}"),
+    ("ex3",  "my stats ({name})",          "stats for {name}"),
+)
+_EX_FIXTURES = (
+    ("ex5",           "my next match",             "my next match"),
+    ("ex_season",     "📋 {club} {age} season",    "season {club} {age}"),
+    ("ex_opp_season", "📋 {opp} {age} season",     "season {opp} {age}"),
+    ("ex6",           "upcoming fixtures {club}",  "upcoming fixtures {club}"),
+)
+_EX_SQUAD = (
+    ("ex_squad",   "squad for {club} {age}",    "squad for {club} {age}"),
+    ("ex_squadOp", "opponent squad ({opp})",    "squad for {opp} {age}"),
+    ("ex_dual",    "2 clubs",                   "2 clubs"),
+    ("ex_dual2",   "dual registration {club}",  "dual registration {club}"),
+)
+_EX_COMPARISON = (
+    ("ex_vs",           "{vs_label}",                 "{vs_query}"),
+    ("ex_pred_ladder",  "📊 predicted ladder {age}",  "predicted ladder {club} {age}"),
+    ("ex_pred_ladder1", "📊 ladder after 1 match",    "predicted ladder {club} {age} after 1 match"),
+)
+_EX_COMPETITIONS = (
+    ("ex_ypl2", "YPL2 ladder", "YPL2 ladder"),
+)
+_EX_CARDS = (
+    ("ex10b",     "cards this week {comp} {age}", "cards this week {comp} {age}"),
+    ("ex10b_all", "all cards {comp} {age}",       "all cards {comp} {age}"),
+    ("ex10c",     "cards per club",               "cards per club"),
+    ("ex10d",     "own goals",                    "own goals"),
+)
+_EX_SCORES = (
+    ("q14", "Latest Results", "latest results {comp}"),
+    ("q15", "Missing Scores", "latest missing scores"),
+)
+_EX_STAFF = (
+    ("ex16",        "coaches for {club}",    "coaches for {club}"),
+    ("ex_staff_rc", "red card staff {club}", "red card staff {club}"),
+)
+
+_EXAMPLE_COLUMNS = (
+    (("📊 Player Stats", _EX_PLAYER_STATS), ("📅 Fixtures & Season", _EX_FIXTURES)),
+    (("👥 Squad & Dual Reg", _EX_SQUAD), ("⚔️ Club Comparison & Prediction", _EX_COMPARISON),
+     ("🏆 Competitions", _EX_COMPETITIONS)),
+    (("🟨🟥 Discipline", _EX_CARDS), ("📰 Results & Scores", _EX_SCORES),
+     ("👔 Coaches & Staff", _EX_STAFF)),
+)
+_EX_ADMIN_ONLY = frozenset({"ex_pred_ladder", "ex_pred_ladder1"})
+
+
+def _queue_example_query(query):
+    """on_click callback: runs before the click's own rerun, so the query is
+    consumed ahead of the search widget without a second st.rerun()."""
+    st.session_state["clicked_query"] = query
+    st.session_state["expander_collapse_counter"] += 1
+
+
 def main_app():
     """Main application logic"""
     header()
-    # Load data
-    results = load_master_results()
-    fixtures = load_fixtures()
-    players_data = load_players_summary()
-    staff_data = load_staff_summary()
-    comp_overview = load_competition_overview()
+    # Load data — one stat per file and one cache lookup for the whole set
+    app_data_version = _file_mtimes(*_APP_DATA_FILES)
+    results, fixtures, players_data, staff_data, comp_overview = load_app_data(app_data_version)
+    # Per-dataset keys sliced from the stats above: results + fixtures, and
+    # players + staff (the same key _people_version() builds)
+    data_version = app_data_version[0:2]
+    people_version = app_data_version[2:4]
+    # Bound once for the log_* calls below; switching user/admin reruns the app.
+    _user = st.session_state["username"]
+    _full = st.session_state["full_name"]
+    _sid  = st.session_state["session_id"]
     
     # 4. Extract names and club info safely
     first_name = st.session_state.get('full_name', 'Champ').split()[0]
@@ -2450,24 +2683,19 @@ def main_app():
 
     with col_left:
         if st.session_state.get("user_type") == "admin":
-            st.markdown(f"""
-                <div class="user-badge">
-                    🔑 Admin: {st.session_state['full_name']}
-                </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_ADMIN_BADGE_HTML.format(full_name=st.session_state['full_name']),
+                        unsafe_allow_html=True)
         else:
             # Player switcher — inline dropdown next to name
-            people = get_players_and_coaches_list(DATA_DIR)
+            people, displays, people_by_display, id_pos, _ = people_index(people_version)
             current_name = st.session_state.get('full_name', 'Guest')
-            options_display = [f"👤 {current_name}  ▾"] + [format_player_display(p) for p in people]
+            options_display = [f"👤 {current_name}  ▾"] + displays
 
             # Find index of current user in list
             current_uid = st.session_state.get("username", "")
             current_idx = 0
-            for i, p in enumerate(people):
-                if p.get("player_id") == current_uid:
-                    current_idx = i + 1  # offset by 1 for the first "current" option
-                    break
+            if current_uid in id_pos:
+                current_idx = id_pos[current_uid] + 1  # offset by 1 for the first "current" option
 
             selected_display = st.selectbox(
                 "Switch player",
@@ -2480,9 +2708,7 @@ def main_app():
 
             # If user picked a real player (not the placeholder)
             if selected_display and selected_display != options_display[0]:
-                selected_person = next(
-                    (p for p in people if format_player_display(p) == selected_display), None
-                )
+                selected_person = people_by_display.get(selected_display)
                 if selected_person and selected_person.get("player_id") != current_uid:
                     league, competition = get_player_league_info(
                         selected_person["name"],
@@ -2497,15 +2723,15 @@ def main_app():
                     st.session_state["player_age_group"]   = selected_person.get("age_group", "")
                     st.session_state["player_role"]        = selected_person["role"]
                     st.session_state["role"]               = selected_person["role"]
-                    st.session_state["last_activity"]      = datetime.now()
+                    st.session_state["last_activity"]      = time.monotonic()
                     st.session_state["player_league"]      = league
                     st.session_state["player_competition"] = competition
-                    save_player_selection(st.session_state["session_id"], selected_person)
+                    save_player_selection(_sid, selected_person)
                     update_user_config(selected_person["club"], selected_person.get("age_group", ""))
                     log_login(
                         username=selected_person["player_id"],
                         full_name=selected_person["name"],
-                        session_id=st.session_state["session_id"]
+                        session_id=_sid
                     )
                     st.query_params["uid"] = selected_person["player_id"]
                     st.rerun()
@@ -2545,7 +2771,7 @@ def main_app():
                             st.session_state["username"]           = admin["username"]
                             st.session_state["full_name"]          = admin["full_name"]
                             st.session_state["role"]               = "admin"
-                            st.session_state["last_activity"]      = datetime.now()
+                            st.session_state["last_activity"]      = time.monotonic()
                             st.session_state["player_club"]        = "Heidelberg United"
                             st.session_state["player_age_group"]   = "U16"
                             st.session_state["player_role"]        = "player"
@@ -2556,7 +2782,7 @@ def main_app():
                             log_login(
                                 username=admin["username"],
                                 full_name=admin["full_name"],
-                                session_id=st.session_state["session_id"]
+                                session_id=_sid
                             )
                             st.rerun()
                         else:
@@ -2662,6 +2888,7 @@ def main_app():
         st.session_state["search_input"]   = ""
         st.session_state["search_answer"]  = None
         st.session_state["search_version"] = 0
+        _drop_nl_query()
         st.session_state["last_processed_version"] = -1
 
     # Initialise history stack
@@ -2671,6 +2898,7 @@ def main_app():
     # Consume _restore_search BEFORE widget renders (back-button restore)
     if "_restore_search" in st.session_state:
         _rs = st.session_state.pop("_restore_search")
+        _drop_nl_query()
         st.session_state["search_input"]       = _rs["query"]
         st.session_state["search_answer"]      = _rs["answer"]
         st.session_state["search_answer_time"] = _rs["answer_time"]
@@ -2712,11 +2940,9 @@ def main_app():
     def _get_next_opponent():
         """Return (opponent_base_name, is_home) for user's next upcoming fixture."""
         try:
-            import pytz as _pytz
             from fast_agent import fixtures as _fixtures, USER_CONFIG as _UC, \
                 parse_date_utc_to_aest as _parse, _strip_age_group as _strip
-            melbourne_tz = _pytz.timezone('Australia/Melbourne')
-            now = datetime.now(melbourne_tz)
+            now = datetime.now(MELBOURNE_TZ)
             # Match on club name + age group independently (more robust than full team string)
             user_club_lower = (_UC.get("club") or "").lower()
             user_age_lower  = (_UC.get("age_group") or "").lower()
@@ -2759,168 +2985,28 @@ def main_app():
     _expander_label = "💡 Example Queries" + "\u200b" * (_collapse % 50)  # invisible chars force new widget when we want collapsed
     with st.expander(_expander_label, expanded=False):
         st.markdown("*Click any example to try it:*")
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.markdown("**📊 Player Stats**")
-
-            q1 = f"top scorers in {user_club}"
-            if st.button(q1, key="ex1", width='content'):
-                st.session_state["clicked_query"] = q1
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q1b = f"most appearances in {user_club}"
-            if st.button(q1b, key="ex1b", width='content'):
-                st.session_state["clicked_query"] = q1b
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-
-            q3 = f"stats for {user_name}"
-            if st.button(f"my stats ({user_name})", key="ex3", width='content'):
-                st.session_state["clicked_query"] = q3
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            st.markdown("**📅 Fixtures & Season**")
-            if st.button("my next match", key="ex5", width='content'):
-                st.session_state["clicked_query"] = "my next match"
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q_season = f"season {user_club} {user_age}"
-            if st.button(f"📋 {user_club} {user_age} season", key="ex_season", width='content'):
-                st.session_state["clicked_query"] = q_season
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            if _next_opp:
-                q_opp_season = f"season {_next_opp} {user_age}"
-                if st.button(f"📋 {_next_opp} {user_age} season", key="ex_opp_season", width='content'):
-                    st.session_state["clicked_query"] = q_opp_season
-                    st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                    st.rerun()
-
-            q6 = f"upcoming fixtures {user_club}"
-            if st.button(q6, key="ex6", width='content'):
-                st.session_state["clicked_query"] = q6
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-        with col2:
-            st.markdown("**👥 Squad & Dual Reg**")
-
-            q_squad = f"squad for {user_club} {user_age}"
-            if st.button(q_squad, key="ex_squad", width='content'):
-                st.session_state["clicked_query"] = q_squad
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            if _next_opp:
-                q_squadOp = f"squad for {_next_opp} {user_age}"
-                if st.button(f"opponent squad ({_next_opp})", key="ex_squadOp", width='content'):
-                    st.session_state["clicked_query"] = q_squadOp
-                    st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                    st.rerun()
-
-            q_dual = "2 clubs"
-            if st.button("2 clubs", key="ex_dual", width='content'):
-                st.session_state["clicked_query"] = q_dual
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q_dual2 = f"dual registration {user_club}"
-            if st.button(q_dual2, key="ex_dual2", width='content'):
-                st.session_state["clicked_query"] = q_dual2
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            st.markdown("**⚔️ Club Comparison & Prediction**")
-            if st.button(_vs_label, key="ex_vs", width='content'):
-                st.session_state["clicked_query"] = _vs_query
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q_pred_ladder = f"predicted ladder {user_club} {user_age}"
-            if st.session_state.get("role") == "admin":
-                if st.button(f"📊 predicted ladder {user_age}", key="ex_pred_ladder", width='content'):
-                    st.session_state["clicked_query"] = q_pred_ladder
-                    st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                    st.rerun()
-
-            q_pred_ladder1 = f"predicted ladder {user_club} {user_age} after 1 match"
-            if st.session_state.get("role") == "admin":
-                if st.button(f"📊 ladder after 1 match", key="ex_pred_ladder1", width='content'):
-                    st.session_state["clicked_query"] = q_pred_ladder1
-                    st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                    st.rerun()
-
-            st.markdown("**🏆 Competitions**")
-            q_ypl2 = "YPL2 ladder"
-            if st.button("YPL2 ladder", key="ex_ypl2", width='content'):
-                st.session_state["clicked_query"] = q_ypl2
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-        with col3:
-            st.markdown("**🟨🟥 Discipline**")
-
-            q10b = f"cards this week {user_competition} {user_age}"
-            if st.button(f"cards this week {user_competition} {user_age}", key="ex10b", width='content'):
-                st.session_state["clicked_query"] = q10b
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q10b_all = f"all cards {user_competition} {user_age}"
-            if st.button(f"all cards {user_competition} {user_age}", key="ex10b_all", width='content'):
-                st.session_state["clicked_query"] = q10b_all
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q10c = "cards per club"
-            if st.button(q10c, key="ex10c", width='content'):
-                st.session_state["clicked_query"] = q10c
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q10d = "own goals"
-            if st.button(q10d, key="ex10d", width='content'):
-                st.session_state["clicked_query"] = q10d
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            st.markdown("**📰 Results & Scores**")
-
-            q14 = f"latest results {user_competition}"
-            if st.button("Latest Results", key="q14", width='content'):
-                st.session_state["clicked_query"] = q14
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q15 = "latest missing scores"
-            if st.button("Missing Scores", key="q15", width='content'):
-                st.session_state["clicked_query"] = q15
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            st.markdown("**👔 Coaches & Staff**")
-            q16 = f"coaches for {user_club}"
-            if st.button(q16, key="ex16", width='content'):
-                st.session_state["clicked_query"] = q16
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
-
-            q_staff_cards = f"red card staff {user_club}"
-            if st.button(q_staff_cards, key="ex_staff_rc", width='content'):
-                st.session_state["clicked_query"] = q_staff_cards
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
-                st.rerun()
+        _fmt = {
+            "club": user_club, "age": user_age, "name": user_name,
+            "comp": user_competition, "opp": _next_opp,
+            "vs_label": _vs_label, "vs_query": _vs_query,
+        }
+        _is_admin = st.session_state.get("role") == "admin"
+        for _col, _sections in zip(st.columns(3), _EXAMPLE_COLUMNS):
+            with _col:
+                for _heading, _buttons in _sections:
+                    st.markdown(f"**{_heading}**")
+                    for _key, _label, _query in _buttons:
+                        if _key in _EX_ADMIN_ONLY and not _is_admin:
+                            continue
+                        if not _next_opp and "{opp}" in _label + _query:
+                            continue
+                        st.button(_label.format(**_fmt), key=_key, width='content',
+                                  on_click=_queue_example_query, args=(_query.format(**_fmt),))
     # ── Process: fires when version advances (typed Enter or button click) ──
     _cur_v = st.session_state["search_version"]
     if search and _cur_v != st.session_state["last_processed_version"]:
         st.session_state["last_processed_version"] = _cur_v
-        st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+        st.session_state["expander_collapse_counter"] += 1
         st.session_state["level"] = "league"
         st.session_state["selected_league"] = None
         st.session_state["selected_competition"] = None
@@ -2931,26 +3017,55 @@ def main_app():
         st.session_state["search_answer"]      = None
         st.session_state["search_answer_time"] = 0.0
         st.session_state["player_list_page"]   = 1  # reset pagination on new search
+        _drop_nl_query()   # drop any query still queued or running
         if is_natural_language_query(search):
             log_search(
-                username=st.session_state["username"],
-                full_name=st.session_state["full_name"],
+                username=_user,
+                full_name=_full,
                 query=search,
-                session_id=st.session_state["session_id"]
+                session_id=_sid
             )
+            _nl_fut = load_query_pool().submit(_timed_process, search, get_script_run_ctx())
+            st.session_state["_nl_future"] = _nl_fut
             with st.spinner("🧠 Analyzing..."):
-                _t0 = time.time()
-                _ans = router.process(search)
-                _t1 = time.time()
-            st.session_state["search_answer"]      = _ans
-            st.session_state["search_answer_time"] = round(_t1 - _t0, 3)
+                wait([_nl_fut], timeout=NL_INLINE_WAIT_SECONDS)
+
+    # ── Collect a finished background query, or keep polling ──────────────
+    _nl_fut = st.session_state.get("_nl_future")
+    if _nl_fut is not None:
+        if _nl_fut.done():
+            del st.session_state["_nl_future"]
+            st.session_state["search_answer"], st.session_state["search_answer_time"] = _nl_fut.result()
+        else:
+            _poll_nl_query()
 
     # ── Render: always show stored answer (persists across reruns) ──────────
     def _fire_query(q):
         st.session_state["clicked_query"] = q
-        st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+        st.session_state["expander_collapse_counter"] += 1
         st.rerun()
 
+    def _answer_frame(answer, slot, rows, date_cols=()):
+        """DataFrame and column_config for one table of the stored answer.
+
+        The answer object survives reruns, so each of its tables (and their
+        date columns) is built once and reused until a new answer arrives.
+        """
+        memo = st.session_state.get("_answer_frames")
+        if memo is None or memo[0] is not answer:
+            memo = (answer, {})
+            st.session_state["_answer_frames"] = memo
+        hit = memo[1].get(slot)
+        if hit is None:
+            df = pd.DataFrame(rows)
+            cfg = {}
+            for col in date_cols:
+                if col in df.columns:
+                    df[col] = pd.to_datetime(df[col], errors="coerce").dt.date
+                    cfg[col] = st.column_config.DateColumn(col, format="ddd, DD-MMM", width="medium")
+            hit = memo[1][slot] = (df, cfg)
+        return hit
+
     def _render_answer(answer):
         st.markdown("---")
         if isinstance(answer, dict):
@@ -2965,7 +3080,7 @@ def main_app():
                 if is_dual:
                     st.caption("🔄 Dual Registration")
                 if reg_rows:
-                    df_reg = pd.DataFrame(reg_rows)
+                    df_reg, _ = _answer_frame(answer, "registrations", reg_rows)
                     st.caption("👇 Click a club row to view their squad")
                     sel_reg = st.dataframe(
                         df_reg, hide_index=True, width='content',
@@ -2980,11 +3095,7 @@ def main_app():
                     label = "📅 Match-by-Match" if detailed else f"📅 Recent Matches (last {len(m_rows)})"
                     st.markdown(f"**{label}**")
                     st.caption("👇 Click a match row to view full match detail (lineups, goals, cards)")
-                    df_m = pd.DataFrame(m_rows)
-                    _cfg = {}
-                    if "Date" in df_m.columns:
-                        df_m["Date"] = pd.to_datetime(df_m["Date"], errors="coerce").dt.date
-                        _cfg["Date"] = st.column_config.DateColumn("Date", format="ddd, DD-MMM", width="medium")
+                    df_m, _cfg = _answer_frame(answer, "matches", m_rows, ("Date",))
                     h = min(600, (len(m_rows) + 1) * 35 + 10)
                     sel_match = st.dataframe(
                         df_m, hide_index=True, width='content',
@@ -3008,7 +3119,7 @@ def main_app():
                 st.info(answer.get("title", "Squad"))
                 data = answer.get("data", [])
                 if data:
-                    df = pd.DataFrame(data)
+                    df, _ = _answer_frame(answer, "data", data)
                     num_rows = len(df)
                     h = 600 if num_rows > 16 else (num_rows + 1) * 35 + 10
                     st.caption("👇 Click a player row to view their stats")
@@ -3428,14 +3539,12 @@ def main_app():
 
                 with st.expander("⚔️ Compare upcoming fixture", expanded=False):
                     try:
-                        import pytz as _pytz
                         import datetime as _dt_mod
                         from fast_agent import (
                             fixtures as _fa_fix,
                             _strip_age_group as _sag
                         )
-                        _mel_tz = _pytz.timezone('Australia/Melbourne')
-                        _now    = _dt_mod.datetime.now(_mel_tz)
+                        _now    = _dt_mod.datetime.now(MELBOURNE_TZ)
 
                         # Key = frozenset of the two stripped club names → keep earliest dt only
                         _earliest: dict = {}   # key → (fh, faw, fdt_full)
@@ -3452,14 +3561,13 @@ def main_app():
                                 # raw UTC "2026-02-08 06:30:00" needs conversion
                                 if " " in _raw and "T" not in _raw and _raw.endswith(":00") and len(_raw) > 10:
                                     # space-separated UTC format — convert to Melbourne
-                                    import pytz as _pz2
                                     _utc_dt = _dt_mod.datetime.strptime(_raw[:19], "%Y-%m-%d %H:%M:%S")
-                                    _utc_dt = _pz2.utc.localize(_utc_dt)
-                                    _fdt_full = _utc_dt.astimezone(_mel_tz)
+                                    _utc_dt = pytz.UTC.localize(_utc_dt)
+                                    _fdt_full = _utc_dt.astimezone(MELBOURNE_TZ)
                                 else:
                                     _fdt_full = _dt_mod.datetime.fromisoformat(_raw[:19])
                                     if _fdt_full.tzinfo is None:
-                                        _fdt_full = _mel_tz.localize(_fdt_full)
+                                        _fdt_full = MELBOURNE_TZ.localize(_fdt_full)
                             except Exception:
                                 continue
 
@@ -3501,7 +3609,7 @@ def main_app():
                 data   = answer.get("data", [])
                 hashes = answer.get("hashes", [])
                 if data:
-                    df = pd.DataFrame(data)
+                    df, _ = _answer_frame(answer, "data", data)
                     h  = min(600, (len(df) + 1) * 35 + 10)
                     st.caption("👇 Click a row to view the full match detail")
                     _og_key = f"og_sel_{st.session_state.get('expander_collapse_counter', 0)}"
@@ -3524,7 +3632,7 @@ def main_app():
                 st.info(answer.get("title", "Matches"))
                 data = answer.get("data", [])
                 if data:
-                    df = pd.DataFrame(data)
+                    df, _ = _answer_frame(answer, "data", data)
                     h  = min(600, (len(df) + 1) * 35 + 10)
                     st.caption("👇 Click a match to view full details & squad")
                     _ml_key = f"match_list_{st.session_state.get('expander_collapse_counter', 0)}"
@@ -3543,14 +3651,7 @@ def main_app():
                 st.info(answer.get("title", "Results"))
                 data = answer.get("data", [])
                 if data:
-                    df = pd.DataFrame(data)
-                    _cfg = {}
-                    if "Date" in df.columns:
-                        df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.date
-                        _cfg["Date"] = st.column_config.DateColumn("Date", format="ddd, DD-MMM", width="medium")
-                    if "First @ To" in df.columns:
-                        df["First @ To"] = pd.to_datetime(df["First @ To"], errors="coerce").dt.date
-                        _cfg["First @ To"] = st.column_config.DateColumn("First @ To", format="ddd, DD-MMM", width="medium")
+                    df, _cfg = _answer_frame(answer, "data", data, ("Date", "First @ To"))
                     num_rows = len(df)
                     final_height = 600 if num_rows > 16 else (num_rows + 1) * 35
                     # Determine name column and whether table is clickable
@@ -3598,7 +3699,7 @@ def main_app():
                         # Pass exact club name directly to tool_club_season to avoid re-matching
                         _exact_q = f"{opt} {age_q}".strip()
                         st.session_state["clicked_query"] = f"season {_exact_q}"
-                        st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                        st.session_state["expander_collapse_counter"] += 1
                         st.rerun()
 
             elif answer.get("type") == "season_summary":
@@ -3636,15 +3737,19 @@ def main_app():
             st.rerun()
 
     level = st.session_state["level"]
+    # Classify once for the league/competition/squad filters below;
+    # a non-NL search filters by name, lowered once here.
+    is_nl = bool(search) and is_natural_language_query(search)
+    name_filter = search.lower() if search and not is_nl else ""
 
     # LEVEL 1: LEAGUES
     if level == "league":
         st.markdown("### 🏆 Select a League")
 
-        leagues = get_all_leagues(results, fixtures)
+        leagues = cached_all_leagues(data_version, results, fixtures)
 
-        if search and not is_natural_language_query(search):
-            leagues = [l for l in leagues if search.lower() in l.lower()]
+        if name_filter:
+            leagues = [l for l in leagues if name_filter in l.lower()]
 
         if not leagues:
             st.info("No leagues found.")
@@ -3663,11 +3768,11 @@ def main_app():
                     
                     # Log the view
                     log_view(
-                        username=st.session_state["username"],
-                        full_name=st.session_state["full_name"],
+                        username=_user,
+                        full_name=_full,
                         view_type="league",
                         league=league_name,
-                        session_id=st.session_state["session_id"]
+                        session_id=_sid
                     )
                     
                     st.rerun()
@@ -3678,7 +3783,7 @@ def main_app():
 
         # Always show leagues so user can switch without hitting Back
         st.markdown("### 🏆 Leagues")
-        all_leagues = get_all_leagues(results, fixtures)
+        all_leagues = cached_all_leagues(data_version, results, fixtures)
         league_cols = st.columns(min(len(all_leagues), 4))
         for idx, league_name in enumerate(all_leagues):
             col_idx = idx % 4
@@ -3694,10 +3799,10 @@ def main_app():
         st.markdown("---")
         st.markdown(f"### 📘 Age Groups in **{league}**")
 
-        comps = get_competitions_for_league(results, fixtures, league)
+        comps = cached_competitions_for_league(data_version, league, results, fixtures)
 
-        if search and not is_natural_language_query(search):
-            comps = [c for c in comps if search.lower() in c.lower()]
+        if name_filter:
+            comps = [c for c in comps if name_filter in c.lower()]
 
         if not comps:
             st.info("No competitions found.")
@@ -3717,12 +3822,12 @@ def main_app():
                     
                     # Log the view
                     log_view(
-                        username=st.session_state["username"],
-                        full_name=st.session_state["full_name"],
+                        username=_user,
+                        full_name=_full,
                         view_type="competition",
                         league=league,
                         competition=comp_name,
-                        session_id=st.session_state["session_id"]
+                        session_id=_sid
                     )
                     
                     st.rerun()
@@ -3736,63 +3841,30 @@ def main_app():
 
         with tab_new:
             st.caption("Rankings based on total match points (W=3, D=1, L=0) earned across all age groups in this league.")
-            overall_ladder = compute_overall_points_ladder(results, league)
+            overall_ladder = cached_overall_points_ladder(data_version, league, results)
             if overall_ladder:
                 overall_ladder_df = pd.DataFrame(overall_ladder)
                 overall_ladder_df.insert(0, "Rank", range(1, len(overall_ladder_df) + 1))
-                overall_display_df = overall_ladder_df[["Rank", "club", "played", "wins", "draws", "losses", "gf", "ga", "gd", "points"]].copy()
+                overall_display_df = overall_ladder_df[["Rank", "club", "played", "wins", "draws", "losses", "gf", "ga", "gd", "points"]]
                 overall_display_df.columns = ["Rank", "Club", "P", "W", "D", "L", "GF", "GA", "GD", "Pts"]
-                st.dataframe(
+                show_capped_dataframe(
                     overall_display_df,
                     hide_index=True,
                     width='content',
-                    height=598,
-                    column_config={
-                        "Rank": st.column_config.NumberColumn("Rank", width="small"),
-                        "Club": st.column_config.TextColumn("Club", width="large"),
-                        "P": st.column_config.NumberColumn("P", width="small"),
-                        "W": st.column_config.NumberColumn("W", width="small"),
-                        "D": st.column_config.NumberColumn("D", width="small"),
-                        "L": st.column_config.NumberColumn("L", width="small"),
-                        "GF": st.column_config.NumberColumn("GF", width="small"),
-                        "GA": st.column_config.NumberColumn("GA", width="small"),
-                        "GD": st.column_config.NumberColumn("GD", width="small"),
-                        "Pts": st.column_config.NumberColumn("Pts", width="small"),
-                    },
+                    column_config=OVERALL_LADDER_COLUMN_CONFIG,
                 )
             else:
                 st.info("No results data found to build the points ladder for this league.")
                 
         with tab_old:
             if league in comp_overview:
-                data = comp_overview[league]
-                age_groups = data.get("age_groups", [])
-                rows = []
-                for club in data.get("clubs", []):
-                    row = {
-                        "Rank": club.get("overall_rank", 0),
-                        "Club": base_club_name(club.get("club", "")),
-                        "Points": club.get("total_position_points", 0),
-                    }
-                    for age in age_groups:
-                        pos = club.get("age_groups", {}).get(age, {}).get("position")
-                        row[age] = pos if pos else "-"
-                    row["GF"] = club.get("total_gf", 0)
-                    row["GA"] = club.get("total_ga", 0)
-                    row["GD"] = club.get("total_gf", 0) - club.get("total_ga", 0)
-                    rows.append(row)
-                df_overview = pd.DataFrame(rows)
-                configs = {
-                    "Rank": st.column_config.NumberColumn("Rank", width="small"),
-                    "Club": st.column_config.TextColumn("Club", width="large"),
-                    "Points": st.column_config.NumberColumn("Pts", width="small"),
-                    "GF": st.column_config.NumberColumn("GF", width="small"),
-                    "GA": st.column_config.NumberColumn("GA", width="small"),
-                    "GD": st.column_config.NumberColumn("GD", width="small"),
-                }
-                for age in age_groups:
-                    configs[age] = st.column_config.TextColumn(age, width="small")
-                st.dataframe(df_overview, hide_index=True, width='content', height=598, column_config=configs)
+                age_groups = comp_overview[league].get("age_groups", [])
+                df_overview = cached_overview_table(
+                    app_data_version[4:5], league, comp_overview
+                )
+                configs = {**OVERVIEW_COLUMN_CONFIG,
+                           **{age: st.column_config.TextColumn(age, width="small") for age in age_groups}}
+                show_capped_dataframe(df_overview, hide_index=True, width='content', column_config=configs)
             else:
                 st.info("No competition overview data available for this league.")
 
@@ -3803,36 +3875,25 @@ def main_app():
         league = st.session_state["selected_league"]
         st.markdown(f"### 📊 Ladder — {comp}")
 
-        results_for_comp = get_results_for_competition(results, comp)
-        ladder = compute_ladder_from_results(results_for_comp)
+        display_df = cached_ladder_table(data_version, comp, results)
 
-        if not ladder:
+        if display_df.empty:
             st.warning("No completed results found for this competition.")
             return
 
-        ladder_df = pd.DataFrame(ladder)
-        ladder_df.insert(0, "Pos", range(1, len(ladder_df) + 1))
-        ladder_df["ClubDisplay"] = ladder_df["club"].apply(base_club_name)
-        
         st.markdown("---")
 
-        # Build display dataframe (no Select column needed)
-        display_df = ladder_df[["Pos", "ClubDisplay", "played", "wins", "draws", "losses",
-                                 "gf", "ga", "gd", "points"]].copy()
-        display_df.columns = ["Pos", "Club", "P", "W", "D", "L", "GF", "GA", "GD", "Pts"]
-
         # Apply zone colours
       #  styled = display_df.style.apply(style_ladder, comp=comp, axis=None)
 
-        st.dataframe(
+        show_capped_dataframe(
             display_df,
             hide_index=True,
             width='content',
-            height=590,
         )
 
         # Club selector below the table
-        club_options = [""] + list(ladder_df["ClubDisplay"])
+        club_options = [""] + display_df["Club"].tolist()
         currently_selected = st.session_state.get("selected_club")
         default_idx = club_options.index(currently_selected) if currently_selected in club_options else 0
 
@@ -3848,13 +3909,13 @@ def main_app():
             st.session_state["selected_club"] = chosen_club
             st.session_state["selected_match_id"] = None
             log_view(
-                username=st.session_state["username"],
-                full_name=st.session_state["full_name"],
+                username=_user,
+                full_name=_full,
                 view_type="club",
                 league=league,
                 competition=comp,
                 club=chosen_club,
-                session_id=st.session_state["session_id"]
+                session_id=_sid
             )
             st.rerun()
         elif not chosen_club and currently_selected:
@@ -3873,10 +3934,10 @@ def main_app():
             
             with col_matches:
                 st.markdown(f"### 📅 Matches")
-                matches = get_matches_for_club_in_comp(results, club, comp)
+                matches = club_match_index(data_version, results).get((comp, club), [])
 
                 if matches:
-                    match_rows = []
+                    m_home_away, m_opponents, m_scores, m_ids = [], [], [], []
                     for m in matches:
                         attrs = m.get("attributes", {})
                         home = attrs.get("home_team_name")
@@ -3895,48 +3956,36 @@ def main_app():
                         else:
                             score = ""
 
-                        match_rows.append({
-                            "Select": False,
-                            "Date": format_date(attrs.get("date", "")),
-                            "H/A": home_away,
-                            "Opponent": base_club_name(opponent),
-                            "Score": score,
-                            "_match_hash_id": attrs.get("match_hash_id"),
-                        })
-
-                    df_matches = pd.DataFrame(match_rows)
-                    df_matches["Select"] = df_matches["Select"].astype(bool)
-
-                    # Pre-tick the currently selected match
-                    current_id = st.session_state.get("selected_match_id")
-                    if current_id:
-                        df_matches["Select"] = df_matches["_match_hash_id"] == current_id
-
-                    edited_matches = st.data_editor(
-                        df_matches[["Select", "Date", "H/A", "Opponent", "Score"]],
+                        m_home_away.append(home_away)
+                        m_opponents.append(base_club_name(opponent))
+                        m_scores.append(score)
+                        m_ids.append(attrs.get("match_hash_id"))
+
+                    df_matches = pd.DataFrame({
+                        "Date": format_dates(m.get("attributes", {}).get("date", "") for m in matches),
+                        "H/A": m_home_away,
+                        "Opponent": m_opponents,
+                        "Score": m_scores,
+                    })
+
+                    # Row selection on a plain dataframe; keyed per club so a
+                    # selection never carries over to another club's list.
+                    st.caption("👇 Click a match to filter the squad")
+                    match_sel = st.dataframe(
+                        df_matches,
                         hide_index=True,
-                        column_config={
-                            "Select": st.column_config.CheckboxColumn("", default=False, width="small"),
-                            "Date": st.column_config.DateColumn("Date", format="ddd, DD-MMM", width="medium"),
-                            "H/A": st.column_config.TextColumn("", width="small"),
-                            "Opponent": st.column_config.TextColumn("Opponent", width="medium"),
-                            "Score": st.column_config.TextColumn("Score", width="small")
-                        },
-                        disabled=["Date", "H/A", "Opponent", "Score"],
+                        column_config=MATCHES_COLUMN_CONFIG,
                         width='content',
-                        key="club_matches_editor"
+                        selection_mode="single-row", on_select="rerun",
+                        key=f"club_matches_sel_{comp}_{club}"
                     )
 
-                    # Single clean selection block — no duplicates
-                    selected_rows = edited_matches[edited_matches["Select"] == True]
-                    if not selected_rows.empty:
-                        new_match_id = df_matches.iloc[selected_rows.index[0]]["_match_hash_id"]
-                        if st.session_state.get("selected_match_id") != new_match_id:
-                            st.session_state["selected_match_id"] = new_match_id
-                            st.rerun()
-                    elif st.session_state.get("selected_match_id") is not None:
-                        st.session_state["selected_match_id"] = None
-                        st.rerun()
+                    # Single clean selection block — no duplicates. The squad panel
+                    # reads selected_match_id further down this same run, so the
+                    # selection's own rerun is enough (no second st.rerun()).
+                    selected_rows = match_sel.selection.get("rows", [])
+                    st.session_state["selected_match_id"] = (
+                        m_ids[selected_rows[0]] if selected_rows else None)
                 else:
                     st.info(f"No matches found")
 
@@ -3944,12 +3993,14 @@ def main_app():
                 st.markdown(f"### 👤 Squad")
                 
                 # Get all people (players + staff) for this club in this competition
-                all_people = get_players_for_club(players_data, club, comp, staff_data)
+                all_people = club_squad_index(
+                    people_version, players_data, staff_data
+                ).get((club, comp), [])
 
-                if search and not is_natural_language_query(search):
+                if name_filter:
                     all_people = [
                         p for p in all_people
-                        if search.lower() in f"{p.get('first_name','')} {p.get('last_name','')}".lower()
+                        if name_filter in f"{p.get('first_name','')} {p.get('last_name','')}".lower()
                     ]
 
                 selected_match_id = st.session_state.get("selected_match_id")
@@ -3975,114 +4026,86 @@ def main_app():
                         # Match summary box
                         st.info(f"**{format_date_full_aest(attrs.get('date', ''))}** vs {base_club_name(opponent)} - **{our_score}-{opp_score}**")
                     # Filter players who played in this match
-                    all_people = [p for p in all_people if player_played_in_match(p, selected_match_id)]
+                    all_people = [p for p in all_people if selected_match_id in p["_matches_by_id"]]
 
                 # Separate players and non-players
 #                players = [p for p in all_people if not p.get("role") or p.get("role") == "player"]
 #                non_players = [p for p in all_people if p.get("role") and p.get("role") != "player"]
-                players = [
-                    p for p in all_people 
-                    if not p.get("role") or p.get("role").lower() == "player"
-                ]
-
-                non_players = [
-                    p for p in all_people 
-                    if p.get("role") and p.get("role").lower() != "player"
+                non_players = [p for p in all_people if p.get("role") and p["role"].lower() != "player"]
+                # Players come with their season table, cached per club/competition;
+                # only the name / match filters are applied here
+                squad_players, squad_df = squad_season_table(
+                    people_version, club, comp, players_data, staff_data)
+                keep = [
+                    i for i, p in enumerate(squad_players)
+                    if (not name_filter
+                        or name_filter in f"{p.get('first_name','')} {p.get('last_name','')}".lower())
+                    and (not selected_match_id or selected_match_id in p["_matches_by_id"])
                 ]
+                players = [squad_players[i] for i in keep]
                 # PLAYERS TABLE
                 if players:
                     st.markdown("**Players**")
                     if any(len(p.get("teams", [])) > 1 for p in players):
                         st.caption("🔁 = also plays another age group at this club · ⚡ = also registered at a different club")
-                    rows = []
-                    for p in players:
-                        full_name   = f"{p.get('first_name','')} {p.get('last_name','')}"
-                        reg         = get_player_reg_info(p, club, comp)
-                        player_age  = reg["age"]
-                        dual_badge  = reg["badge"]
-                        jerseys_map = p.get("jerseys", {})
-                        jersey      = jerseys_map.get(
-                            next((t for t in p.get("teams", []) if base_club_name(t) == club), ""),
-                            p.get("jersey", "")
-                        )
-
-                        if selected_match_id:
+                    p_rows = players
+                    df_players = squad_df.iloc[keep].reset_index(drop=True)
+                    if selected_match_id:
+                        # One match: name indicators and that match's goals/cards
+                        p_names, p_g, p_y, p_r = [], [], [], []
+                        for p, full_name, dual_badge in zip(players, df_players["_name"], df_players["_badge"]):
                             match_data = get_player_match_stats(p, selected_match_id)
-                            if match_data:
-                                indicators = []
-                                if match_data.get("captain"): indicators.append("(C)")
-                                if match_data.get("goalie"):  indicators.append("🥅")
-                                if indicators:
-                                    full_name = f"{full_name} {' '.join(indicators)}"
-                                events = match_data.get("events", [])
-                                def _etype(e): return (e.get("type") or e.get("event_type") or "").lower()
-                                goals_m   = sum(1 for e in events if _etype(e) == "goal")
-                                yellows_m = sum(1 for e in events if _etype(e) == "yellow_card")
-                                reds_m    = sum(1 for e in events if _etype(e) == "red_card")
-                                is_captain = (
-                                    match_data.get("captain") or
-                                    match_data.get("role_in_match", "").lower() == "captain" or
-                                    p.get("stats", {}).get("matches_captained", 0) > 0
-                                )
-                                if is_captain and "(C)" not in full_name:
-                                    full_name = f"{full_name} (C)"
-                                rows.append({
-                                    "Select": False, "Age": player_age,
-                                    "Player": f"{full_name}{dual_badge}", "#": jersey,
-                                    "M": 1, "G": goals_m, "🟨": yellows_m, "🟥": reds_m,
-                                })
-                        else:
-                            rows.append({
-                                "Select": False, "Age": player_age,
-                                "Player": f"{full_name}{dual_badge}", "#": jersey,
-                                "M": len([m for m in p.get("matches", [])
-                                          if m.get("available", False) or m.get("started", False)]),
-                                "G": p.get("stats", {}).get("goals", 0),
-                                "🟨": p.get("stats", {}).get("yellow_cards", 0),
-                                "🟥": p.get("stats", {}).get("red_cards", 0),
-                            })
-
-                    df_players = pd.DataFrame(rows)
-                    df_players["Select"] = df_players["Select"].astype(bool)
-                    edited_players = st.data_editor(
+                            indicators = []
+                            if match_data.get("captain"): indicators.append("(C)")
+                            if match_data.get("goalie"):  indicators.append("🥅")
+                            if indicators:
+                                full_name = f"{full_name} {' '.join(indicators)}"
+                            goals_m, yellows_m, reds_m = _match_event_counts(p).get(
+                                selected_match_id, (0, 0, 0))
+                            is_captain = (
+                                match_data.get("captain") or
+                                match_data.get("role_in_match", "").lower() == "captain" or
+                                (p.get("stats") or {}).get("matches_captained", 0) > 0
+                            )
+                            if is_captain and "(C)" not in full_name:
+                                full_name = f"{full_name} (C)"
+                            p_names.append(f"{full_name}{dual_badge}")
+                            p_g.append(goals_m)
+                            p_y.append(yellows_m)
+                            p_r.append(reds_m)
+                        df_players["Player"] = p_names
+                        df_players["M"] = 1
+                        df_players["G"], df_players["🟨"], df_players["🟥"] = p_g, p_y, p_r
+                    df_players = df_players[["Age", "Player", "#", "M", "G", "🟨", "🟥"]]
+                    st.caption("👇 Click a player to view details")
+                    # Key changes with the match filter (different rows) and on
+                    # ✖ Close (clears the highlighted row).
+                    player_sel = st.dataframe(
                         df_players, hide_index=True,
-                        column_config={
-                            "Select": st.column_config.CheckboxColumn("", help="View details", default=False),
-                            "Age":    st.column_config.TextColumn("Age", width="small"),
-                            "Player": st.column_config.TextColumn("Player", width="medium"),
-                            "#":      st.column_config.TextColumn("#", width="small"),
-                            "M":      st.column_config.NumberColumn("M", width="small", help="Matches"),
-                            "G":      st.column_config.NumberColumn("G", width="small", help="Goals"),
-                            "🟨":     st.column_config.NumberColumn("🟨", width="small"),
-                            "🟥":     st.column_config.NumberColumn("🟥", width="small"),
-                        },
-                        disabled=["Age", "Player", "#", "M", "G", "🟨", "🟥"],
-                        width='content', height=730, key="players_editor"
+                        column_config=PLAYERS_COLUMN_CONFIG,
+                        width='content', height=730,
+                        selection_mode="single-row", on_select="rerun",
+                        key=f"players_sel_{comp}_{club}_{selected_match_id}_{st.session_state.get('_squad_sel_nonce', 0)}"
                     )
 
-                    selected_player_rows = edited_players[edited_players["Select"] == True]
-                    if not selected_player_rows.empty:
-                        idx = selected_player_rows.index[0]
-                        selected_player = players[idx]
-                        # Stay on ladder_clubs — show details below instead of navigating away
+                    selected_player_rows = player_sel.selection.get("rows", [])
+                    if selected_player_rows:
+                        selected_player = p_rows[selected_player_rows[0]]
+                        # Stay on ladder_clubs — show details below instead of navigating away;
+                        # the detail panel is drawn later in this run, so no st.rerun()
                         if st.session_state.get("selected_player") != selected_player:
                             st.session_state["selected_player"] = selected_player
-                            player_name = f"{selected_player.get('first_name','')} {selected_player.get('last_name','')}"
                             log_view(
-                                username=st.session_state["username"],
-                                full_name=st.session_state["full_name"],
+                                username=_user,
+                                full_name=_full,
                                 view_type="player",
                                 league=league,
                                 competition=comp,
                                 club=club,
-                                player=player_name,
-                                session_id=st.session_state["session_id"]
+                                session_id=_sid
                             )
-                            st.rerun()
-                    else:
-                        if st.session_state.get("selected_player") is not None:
-                            st.session_state["selected_player"] = None
-                            st.rerun()
+                    elif st.session_state.get("selected_player") is not None:
+                        st.session_state["selected_player"] = None
                 else:
                     if selected_match_id:
                         st.info("No players in selected match")
@@ -4092,27 +4115,18 @@ def main_app():
                 # NON-PLAYERS TABLE (STAFF/COACHES)
                 if non_players:
                     st.markdown("**Staff & Coaches**")
-                    staff_rows = []
-                    for p in non_players:
-                        full_name = f"{p.get('first_name','')} {p.get('last_name','')}"
-                        role = p.get("role", "staff").title()
-                        staff_rows.append({
-                            "Name": full_name,
-                            "Role": role,
-                            "🟨": p.get("stats", {}).get("yellow_cards", 0),
-                            "🟥": p.get("stats", {}).get("red_cards", 0),
-                        })
-
-                    df_staff = pd.DataFrame(staff_rows)
+                    staff_stats = [p.get("stats") or {} for p in non_players]
+                    df_staff = pd.DataFrame({
+                        "Name": list(map(" ".join, zip([p.get("first_name", "") for p in non_players],
+                                                       [p.get("last_name", "") for p in non_players]))),
+                        "Role": [p.get("role", "staff").title() for p in non_players],
+                        "🟨": [s.get("yellow_cards", 0) for s in staff_stats],
+                        "🟥": [s.get("red_cards", 0) for s in staff_stats],
+                    })
                     st.dataframe(
                         df_staff,
                         hide_index=True,
-                        column_config={
-                            "Name": st.column_config.TextColumn("Name", width="medium"),
-                            "Role": st.column_config.TextColumn("Role", width="small"),
-                            "🟨": st.column_config.NumberColumn("🟨", width="small"),
-                            "🟥": st.column_config.NumberColumn("🟥", width="small")
-                        },
+                        column_config=STAFF_COLUMN_CONFIG,
                         width='content',
                     )
 # PLAYER DETAIL PANEL — inline below squad
@@ -4151,6 +4165,7 @@ def main_app():
                     with col_px:
                         if st.button("✖ Close", key="close_player_detail"):
                             st.session_state["selected_player"] = None
+                            st.session_state["_squad_sel_nonce"] = st.session_state.get("_squad_sel_nonce", 0) + 1
                             st.rerun()
 
                     player_matches = sorted(
@@ -4237,19 +4252,15 @@ def main_app():
             st.info("No matches found for this player.")
             return
 
-        rows = []
-        for m in matches:
-            rows.append({
-                "Date": format_date_aest(m.get("date", "")),
-                "Competition": m.get("competition_name"),
-                "Opponent": base_club_name(m.get("opponent_team_name", "")),
-                "H/A": "🏠" if m.get("home_or_away") == "home" else "✈️",
-                "Goals": m.get("goals", 0),
-                "🟨": m.get("yellow_cards", 0),
-                "🟥": m.get("red_cards", 0),
-            })
-
-        df = pd.DataFrame(rows)
+        df = pd.DataFrame({
+            "Date": format_dates((m.get("date", "") for m in matches), aest=True),
+            "Competition": [m.get("competition_name") for m in matches],
+            "Opponent": [base_club_name(m.get("opponent_team_name", "")) for m in matches],
+            "H/A": ["🏠" if m.get("home_or_away") == "home" else "✈️" for m in matches],
+            "Goals": [m.get("goals", 0) for m in matches],
+            "🟨": [m.get("yellow_cards", 0) for m in matches],
+            "🟥": [m.get("red_cards", 0) for m in matches],
+        })
         st.dataframe(
             df, 
             hide_index=True, 
@@ -4277,15 +4288,22 @@ def main():
 
     params = st.query_params
 
-    # Handle URL search param (always, regardless of auth state)
+    # Handle URL search param (always, regardless of auth state).
+    # Routed through clicked_query, so a ?search= link (see search_link)
+    # runs and logs that query like an example-button click. Each distinct
+    # URL value is taken once, so it doesn't overwrite what the user types
+    # on later reruns.
     if "search" in params:
-        st.session_state["search_input_value"] = params["search"].replace("+", " ")
+        _url_search = params["search"].replace("+", " ")
+        if st.session_state.get("_url_search") != _url_search:
+            st.session_state["_url_search"]   = _url_search
+            st.session_state["clicked_query"] = _url_search
 
     # ✅ Auto-login if uid is in the URL and not yet authenticated
     if not st.session_state["authenticated"] and "uid" in params:
         uid = params["uid"]
-        people = get_players_and_coaches_list(DATA_DIR)
-        matched = next((p for p in people if p.get("player_id") == uid), None)
+        people, _, _, id_pos, _ = people_index(_people_version())
+        matched = people[id_pos[uid]] if uid in id_pos else None
         if matched:
             league, competition = get_player_league_info(
                 matched["name"],
@@ -4300,7 +4318,7 @@ def main():
             st.session_state["player_age_group"] = matched.get("age_group", "")
             st.session_state["player_role"] = matched["role"]
             st.session_state["role"] = matched["role"]
-            st.session_state["last_activity"] = datetime.now()
+            st.session_state["last_activity"] = time.monotonic()
             st.session_state["player_league"] = league
             st.session_state["player_competition"] = competition
             update_user_config(matched["club"], matched.get("age_group", ""))
@@ -4326,7 +4344,7 @@ def main():
             st.session_state["player_age_group"] = "U16"
             st.session_state["player_role"]      = "player"
             st.session_state["role"]             = "player"
-            st.session_state["last_activity"]    = datetime.now()
+            st.session_state["last_activity"]    = time.monotonic()
             st.session_state["player_league"]    = "YPL2"
             st.session_state["player_competition"] = "YPL2"
             update_user_config("Heidelberg United FC", "U16")
@@ -4342,7 +4360,7 @@ def main():
         st.session_state["player_age_group"] = "U16"
         st.session_state["player_role"]      = "player"
         st.session_state["role"]             = "player"
-        st.session_state["last_activity"]    = datetime.now()
+        st.session_state["last_activity"]    = time.monotonic()
         st.session_state["player_league"]    = "YPL2"
         st.session_state["player_competition"] = "YPL2"
         update_user_config("Heidelberg United FC", "U16")
@@ -7,8 +7,13 @@ import os
 import re
 from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import lru_cache
 import pytz
 import uuid
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import plotly.graph_objects as go
 import io
 import random
@@ -26,6 +31,7 @@ from player_config import (
 )
 # ADD after imports:
 SESSION_TIMEOUT_MINUTES = 240  # 4 hours
+SESSION_TIMEOUT_SECONDS = SESSION_TIMEOUT_MINUTES * 60
 
 def get_client_ip():
     """Get client IP address from Streamlit request headers"""
@@ -194,7 +200,7 @@ def init_session_state():
         st.session_state["device_id"] = st.query_params.get("_did", "")
     
     if "last_activity" not in st.session_state:
-        st.session_state["last_activity"] = datetime.now()
+        st.session_state["last_activity"] = time.monotonic()
     
     if "level" not in st.session_state:
         st.session_state["level"] = "league"
@@ -239,14 +245,13 @@ def init_session_state():
 def check_session_timeout():
     """Check if session has timed out"""
     if st.session_state["authenticated"]:
-        time_diff = datetime.now() - st.session_state["last_activity"]
-        if time_diff.total_seconds() > (SESSION_TIMEOUT_MINUTES * 260):
+        if time.monotonic() - st.session_state["last_activity"] > SESSION_TIMEOUT_SECONDS:
             logout_user()
             st.warning(f"Session timed out after {SESSION_TIMEOUT_MINUTES} minutes of inactivity")
             return False
         
         # Update last activity
-        st.session_state["last_activity"] = datetime.now()
+        st.session_state["last_activity"] = time.monotonic()
     return True
 
    
@@ -319,7 +324,7 @@ def show_login_page():
                     st.session_state["player_age_group"] = saved_selection.get("age_group", "")
                     st.session_state["player_role"] = saved_selection["role"]
                     st.session_state["role"] = saved_selection["role"]
-                    st.session_state["last_activity"] = datetime.now()
+                    st.session_state["last_activity"] = time.monotonic()
                     st.session_state["player_league"] = selected_person.get("league", "")
                     st.session_state["player_competition"] = selected_person.get("competition", "")
                     # Update USER_CONFIG in fast_agent
@@ -359,7 +364,7 @@ def show_login_page():
             st.session_state["player_age_group"] = "U16"
             st.session_state["player_role"] = "player"
             st.session_state["role"] = "player"
-            st.session_state["last_activity"] = datetime.now()
+            st.session_state["last_activity"] = time.monotonic()
             st.session_state["player_league"] = league
             st.session_state["player_competition"] = competition
             update_user_config("Heidelberg United", "U16")
@@ -428,7 +433,7 @@ def show_login_page():
                         st.session_state["player_age_group"] = selected_person.get("age_group", "")
                         st.session_state["player_role"] = selected_person["role"]
                         st.session_state["role"] = selected_person["role"]
-                        st.session_state["last_activity"] = datetime.now()
+                        st.session_state["last_activity"] = time.monotonic()
                         
                         # Save selection
                         save_player_selection(st.session_state["session_id"], selected_person)
@@ -471,7 +476,7 @@ def show_login_page():
                             st.session_state["username"] = admin["username"]
                             st.session_state["full_name"] = admin["full_name"]
                             st.session_state["role"] = "admin"
-                            st.session_state["last_activity"] = datetime.now()
+                            st.session_state["last_activity"] = time.monotonic()
                             # Default player context to Shaurya / Heidelberg United U16
                             st.session_state["player_club"] = "Heidelberg United"
                             st.session_state["player_age_group"] = "U16"
@@ -507,8 +512,7 @@ def get_last_updated_time():
     
     try:
         # Try to get from JSON first
-        with open(results_path, 'r') as f:
-            data = json.load(f)
+        data = _read_json(results_path)
         
         if '_last_updated' in data:
             update_time = datetime.fromisoformat(data['_last_updated'])
@@ -537,7 +541,7 @@ def get_last_updated_time():
 
 @st.cache_resource
 def load_router():
-    """Load the query router (cached per session)"""
+    """Load the query router (built once per process, shared by all sessions)"""
     return FastQueryRouter()
 
 router = load_router()
@@ -545,9 +549,24 @@ router = load_router()
 # ---------------------------------------------------------
 # Data loaders
 # ---------------------------------------------------------
-
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_master_results():
+# cache_resource, not cache_data: every session shares one parsed copy
+# instead of unpickling the full JSON on each rerun. Callers treat the
+# returned objects as read-only.
+#
+# Each loader is keyed on its file's mtime (pass _data_file_version(<file>)),
+# so a pipeline rewrite is picked up on the next rerun and an unchanged file
+# is never re-parsed; max_entries=1 drops the previous copy.
+
+def _read_json(path):
+    """Parse a JSON data file, using orjson on the raw bytes when installed."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_master_results(version):
     """Load master_results.json"""
     path = os.path.join(DATA_DIR, "master_results.json")
     
@@ -555,8 +574,7 @@ def load_master_results():
         return []
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         if isinstance(data, dict):
             if "results" in data:
@@ -578,8 +596,8 @@ def load_master_results():
         st.error(f"Error loading results: {str(e)}")
         return []
 
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_fixtures():
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_fixtures(version):
     """Load fixtures.json"""
     path = os.path.join(DATA_DIR, "fixtures.json")
     
@@ -587,8 +605,7 @@ def load_fixtures():
         return []
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         if isinstance(data, dict):
             if "fixtures" in data:
@@ -610,8 +627,8 @@ def load_fixtures():
         st.error(f"Error loading fixtures: {str(e)}")
         return []
 
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_players_summary():
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_players_summary(version):
     """Load players_summary.json"""
     path = os.path.join(DATA_DIR, "players_summary.json")
     
@@ -619,8 +636,7 @@ def load_players_summary():
         return {"players": []}
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         if isinstance(data, dict):
             if "players" in data:
@@ -639,8 +655,8 @@ def load_players_summary():
         return {"players": []}
 
 
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_staff_summary():
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_staff_summary(version):
     """Load staff_summary.json"""
     path = os.path.join(DATA_DIR, "staff_summary.json")
     
@@ -648,8 +664,7 @@ def load_staff_summary():
         return {"staff": []}
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         if isinstance(data, dict):
             if "staff" in data:
@@ -667,8 +682,8 @@ def load_staff_summary():
         st.error(f"Error loading staff: {str(e)}")
         return {"staff": []}
 
-@st.cache_data(ttl=900)  # Auto-refresh every 5 minutes
-def load_competition_overview():
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_competition_overview(version):
     """Load competition_overview.json"""
     path = os.path.join(DATA_DIR, "competition_overview.json")
     
@@ -676,8 +691,7 @@ def load_competition_overview():
         return {}
     
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(path)
         
         if isinstance(data, dict):
             return data
@@ -689,33 +703,33 @@ def load_competition_overview():
 
 def force_reload_all_data():
     """Force reload of all data including fast_agent module data"""
-    import importlib
-    import sys
-    
-    # Clear Streamlit caches
+    # Clear Streamlit caches. Only the data loaders are dropped from
+    # cache_resource — the router stays alive.
     st.cache_data.clear()
-    st.cache_resource.clear()
+    for loader in (load_master_results, load_fixtures, load_players_summary,
+                   load_staff_summary, load_competition_overview, club_match_index):
+        loader.clear()
     
-    # Force reimport of fast_agent to reload its module-level data
-    if 'fast_agent' in sys.modules:
-        importlib.reload(sys.modules['fast_agent'])
-    
-    # Reinitialize router with fresh data
-    global router
-    from fast_agent import FastQueryRouter
-    router = FastQueryRouter()
+    # Refresh fast_agent's module-level data in place
+    router.reload_data()
 
 # ---------------------------------------------------------
 # Helper functions (same as before)
 # ---------------------------------------------------------
 
+_AGE_SUFFIX_RE = re.compile(r'\s+U\d{2}$')
+
+@lru_cache(maxsize=4096)
 def base_club_name(team_name: str) -> str:
     if not team_name:
         return ""
-    pattern = r'\s+U\d{2}$'
-    cleaned = re.sub(pattern, '', team_name).strip()
+    cleaned = _AGE_SUFFIX_RE.sub('', team_name).strip()
     return cleaned
 
+def base_club_name_series(team_names: pd.Series) -> pd.Series:
+    """base_club_name over a whole column, in pandas' string methods."""
+    return team_names.fillna("").str.replace(_AGE_SUFFIX_RE, "", regex=True).str.strip()
+
 
 def get_player_reg_info(player: dict, current_club: str, current_comp: str) -> dict:
     """Classify dual registrations relative to current club/competition."""
@@ -925,6 +939,51 @@ def get_matches_for_club_in_comp(results, club_name, competition):
             matches.append(item)
     return matches
 
+def _data_file_version(name):
+    """mtime of a data file — changes whenever the pipeline rewrites it."""
+    try:
+        return os.path.getmtime(os.path.join(DATA_DIR, name))
+    except OSError:
+        return 0.0
+
+def _results_version():
+    return _data_file_version("master_results.json")
+
+@st.cache_resource(ttl=900, max_entries=2, show_spinner=False)
+def club_match_index(version, _results):
+    """{(competition, base club): [completed results]} — same rows as get_matches_for_club_in_comp."""
+    index = defaultdict(list)
+    for item in _results:
+        attrs = item.get("attributes", {})
+        if attrs.get("status") != "complete":
+            continue
+        comp = extract_competition_from_league_name(attrs.get("league_name"))
+        home_base = base_club_name(attrs.get("home_team_name"))
+        away_base = base_club_name(attrs.get("away_team_name"))
+        index[(comp, home_base)].append(item)
+        if away_base != home_base:
+            index[(comp, away_base)].append(item)
+    return dict(index)
+
+@st.cache_data(ttl=900, show_spinner=False)
+def cached_overview_table(version, league, _comp_overview):
+    """Flatten competition_overview[league] into the old position-ladder table."""
+    data = _comp_overview[league]
+    clubs = data.get("clubs", [])
+    club_ages = [club.get("age_groups", {}) for club in clubs]
+    overview_cols = {
+        "Rank":   [club.get("overall_rank", 0) for club in clubs],
+        "Club":   [base_club_name(club.get("club", "")) for club in clubs],
+        "Points": [club.get("total_position_points", 0) for club in clubs],
+    }
+    for age in data.get("age_groups", []):
+        overview_cols[age] = [ca.get(age, {}).get("position") or "-" for ca in club_ages]
+    overview_cols["GF"] = [club.get("total_gf", 0) for club in clubs]
+    overview_cols["GA"] = [club.get("total_ga", 0) for club in clubs]
+    df_overview = pd.DataFrame(overview_cols)
+    df_overview["GD"] = df_overview["GF"] - df_overview["GA"]
+    return df_overview
+
 def _person_teams_and_leagues(p):
     """Get (team, league) pairs for a person. Handles both team_name/league_name and teams/leagues arrays."""
     teams = p.get("teams", [])
@@ -1243,33 +1302,38 @@ def header():
     """, unsafe_allow_html=True)
 
 
+_NL_KEYWORDS = (
+    "stats for", "when", "where", "how many", "what", "who",
+    "next match", "last match", "results for", "goals", "cards",
+    "when do i play", "my next", "upcoming", "schedule", "fixture",
+    "details for", "top scorer", "ladder", "table", "form",
+    "yellow card", "red card", "lineup", "vs", " v ",
+    "team", "overview", "competition", "standings", "rankings",
+    "ypl1", "ypl2", "ysl", "missing score", "no score", "overdue",
+    "coach", "coaches", "staff", "manager", "managers",
+    "today", "todays", "result",
+    # Squad / player list queries
+    "show me", "players for", "players in", "list players",
+    "squad", "who plays", "players at",
+    # Dual registration — all variants
+    "dual", "cross club", "different club", "multiple club",
+    "2 clubs", "2 teams", "two clubs", "two teams",
+    "playing for 2", "playing for two", "2 or more",
+    "registered in 2", "registered at 2",
+    "dual matches", "matches both teams", "matches each team",
+    "breakdown", " vs ", " v ",
+    # Appearances / scorers
+    "most appearances", "most matches", "most games", "appearances",
+    "games played", "matches played", "top scorers", "golden boot",
+    "leading scorer",
+)
+# One alternation over all keywords (longest first); a match anywhere is the
+# same test as `any(keyword in query.lower() ...)`, but done in a single C scan.
+_NL_RE = re.compile("|".join(re.escape(k) for k in sorted(set(_NL_KEYWORDS), key=len, reverse=True)))
+
+@lru_cache(maxsize=256)
 def is_natural_language_query(query):
-    keywords = [
-        "stats for", "when", "where", "how many", "what", "who",
-        "next match", "last match", "results for", "goals", "cards",
-        "when do i play", "my next", "upcoming", "schedule", "fixture",
-        "details for", "top scorer", "ladder", "table", "form",
-        "yellow card", "red card", "lineup", "vs", " v ",
-        "team", "overview", "competition", "standings", "rankings",
-        "ypl1", "ypl2", "ysl", "missing score", "no score", "overdue",
-        "coach", "coaches", "staff", "manager", "managers",
-        "today", "todays", "result",
-        # Squad / player list queries
-        "show me", "players for", "players in", "list players",
-        "squad", "who plays", "players at",
-        # Dual registration — all variants
-        "dual", "cross club", "different club", "multiple club",
-        "2 clubs", "2 teams", "two clubs", "two teams",
-        "playing for 2", "playing for two", "2 or more",
-        "registered in 2", "registered at 2",
-        "dual matches", "matches both teams", "matches each team",
-        "breakdown", " vs ", " v ",
-        # Appearances / scorers
-        "most appearances", "most matches", "most games", "appearances",
-        "games played", "matches played", "top scorers", "golden boot",
-        "leading scorer",
-    ]
-    return any(keyword in query.lower() for keyword in keywords)
+    return _NL_RE.search(query.lower()) is not None
 
 # ---------------------------------------------------------
 # Admin Dashboard
@@ -1291,13 +1355,7 @@ def show_admin_dashboard():
             except Exception as e:
                 st.error(f"Refresh failed: {e}")
     with col_r2:
-        try:
-            from fast_agent import _load_all_data
-            import inspect
-            # Show when cache was last populated (approximate)
-            st.caption("Cache refreshes every 5 min automatically")
-        except Exception:
-            pass
+        st.caption("Cache refreshes when data files change")
 
     st.markdown("---")
     # Tabs for different views
@@ -1456,7 +1514,7 @@ def get_player_league_info(player_name: str, club: str, age_group: str):
     """Look up player's league and competition from loaded data"""
     try:
         # Load player data
-        players_data = load_players_summary()
+        players_data = load_players_summary(_data_file_version("players_summary.json"))
         players = players_data.get("players", [])
         
         # Split name
@@ -1489,7 +1547,7 @@ def get_player_league_info(player_name: str, club: str, age_group: str):
                 return league, competition
         
         # If not found in players, try staff
-        staff_data = load_staff_summary()
+        staff_data = load_staff_summary(_data_file_version("staff_summary.json"))
         staff = staff_data.get("staff", [])
         
         for s in staff:
@@ -1555,11 +1613,11 @@ def main_app():
     """Main application logic"""
     header()
     # Load data
-    results = load_master_results()
-    fixtures = load_fixtures()
-    players_data = load_players_summary()
-    staff_data = load_staff_summary()
-    comp_overview = load_competition_overview()
+    results = load_master_results(_data_file_version("master_results.json"))
+    fixtures = load_fixtures(_data_file_version("fixtures.json"))
+    players_data = load_players_summary(_data_file_version("players_summary.json"))
+    staff_data = load_staff_summary(_data_file_version("staff_summary.json"))
+    comp_overview = load_competition_overview(_data_file_version("competition_overview.json"))
     
     # 4. Extract names and club info safely
     first_name = st.session_state.get('full_name', 'Champ').split()[0]
@@ -1747,38 +1805,38 @@ def main_app():
             q1 = f"top scorers in {user_club}"
             if st.button(q1, key="ex1", use_container_width=False):
                 st.session_state["clicked_query"] = q1
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q1b = f"most appearances in {user_club}"
             if st.button(q1b, key="ex1b", use_container_width=False):
                 st.session_state["clicked_query"] = q1b
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
 
             q3 = f"stats for {user_name}"
             if st.button(f"my stats ({user_name})", key="ex3", use_container_width=False):
                 st.session_state["clicked_query"] = q3
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q4 = f"team stats for {user_club} {user_age}"
             if st.button(q4, key="ex4", use_container_width=False):
                 st.session_state["clicked_query"] = q4
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             st.markdown("**📅 Fixtures**")
             if st.button("my next match", key="ex5", use_container_width=False):
                 st.session_state["clicked_query"] = "my next match"
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q6 = f"upcoming fixtures {user_club}"
             if st.button(q6, key="ex6", use_container_width=False):
                 st.session_state["clicked_query"] = q6
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
         with col2:
@@ -1787,51 +1845,51 @@ def main_app():
             q_squad = f"squad for {user_club} {user_age}"
             if st.button(q_squad, key="ex_squad", use_container_width=False):
                 st.session_state["clicked_query"] = q_squad
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q_dual = "2 clubs"
             if st.button("2 clubs", key="ex_dual", use_container_width=False):
                 st.session_state["clicked_query"] = q_dual
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q_dual2 = f"dual registration {user_club}"
             if st.button(q_dual2, key="ex_dual2", use_container_width=False):
                 st.session_state["clicked_query"] = q_dual2
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             st.markdown("**⚔️ Club Comparison**")
             if st.button(_vs_label, key="ex_vs", use_container_width=False):
                 st.session_state["clicked_query"] = _vs_query
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             st.markdown("**🏆 Competitions**")
             q7 = f"{user_age} {user_league} ladder"
             if st.button(q7, key="ex7", use_container_width=False):
                 st.session_state["clicked_query"] = q7
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q8 = f"{user_competition} ladder"
             if st.button(q8, key="ex8", use_container_width=False):
                 st.session_state["clicked_query"] = q8
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             st.markdown("**👔 Coaches & Staff**")
             q16 = f"coaches for {user_club}"
             if st.button(q16, key="ex16", use_container_width=False):
                 st.session_state["clicked_query"] = q16
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q_staff_cards = f"red card staff {user_club}"
             if st.button(q_staff_cards, key="ex_staff_rc", use_container_width=False):
                 st.session_state["clicked_query"] = q_staff_cards
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
         with col3:
@@ -1840,51 +1898,51 @@ def main_app():
             q10 = f"red cards in {user_age}"
             if st.button(q10, key="ex10", use_container_width=False):
                 st.session_state["clicked_query"] = q10
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q10b = "red cards last week"
             if st.button(q10b, key="ex10b", use_container_width=False):
                 st.session_state["clicked_query"] = q10b
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q2 = f"yellow cards {user_club} {user_age}"
             if st.button(q2, key="ex2", use_container_width=False):
                 st.session_state["clicked_query"] = q2
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q2b = f"yellow cards {user_age} last week"
             if st.button(q2b, key="ex2b", use_container_width=False):
                 st.session_state["clicked_query"] = q2b
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             st.markdown("**⚠️ Missing Scores**")
             q13 = f"missing scores {user_club}"
             if st.button(q13, key="ex13", use_container_width=False):
                 st.session_state["clicked_query"] = q13
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             st.markdown("**📊 Today's Games**")
             q14 = "todays results"
             if st.button("Today's Results", key="q14", use_container_width=False):
                 st.session_state["clicked_query"] = q14
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
 
             q15 = "missing scores today"
             if st.button(q15, key="q15", use_container_width=False):
                 st.session_state["clicked_query"] = q15
-                st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+                st.session_state["expander_collapse_counter"] += 1
                 st.rerun()
     # ── Process: fires when version advances (typed Enter or button click) ──
     _cur_v = st.session_state["search_version"]
     if search and _cur_v != st.session_state["last_processed_version"]:
         st.session_state["last_processed_version"] = _cur_v
-        st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+        st.session_state["expander_collapse_counter"] += 1
         st.session_state["level"] = "league"
         st.session_state["selected_league"] = None
         st.session_state["selected_competition"] = None
@@ -1911,7 +1969,7 @@ def main_app():
     # ── Render: always show stored answer (persists across reruns) ──────────
     def _fire_query(q):
         st.session_state["clicked_query"] = q
-        st.session_state["expander_collapse_counter"] = st.session_state.get("expander_collapse_counter", 0) + 1
+        st.session_state["expander_collapse_counter"] += 1
         st.rerun()
 
     def _render_answer(answer):
@@ -2072,6 +2130,8 @@ def main_app():
             st.rerun()
 
     level = st.session_state["level"]
+    # A non-NL search filters the lists below by name; classify and lower it once.
+    name_filter = search.lower() if search and not is_natural_language_query(search) else ""
 
     # LEVEL 1: LEAGUES
     if level == "league":
@@ -2079,8 +2139,8 @@ def main_app():
 
         leagues = get_all_leagues(results, fixtures)
 
-        if search and not is_natural_language_query(search):
-            leagues = [l for l in leagues if search.lower() in l.lower()]
+        if name_filter:
+            leagues = [l for l in leagues if name_filter in l.lower()]
 
         if not leagues:
             st.info("No leagues found.")
@@ -2132,8 +2192,8 @@ def main_app():
 
         comps = get_competitions_for_league(results, fixtures, league)
 
-        if search and not is_natural_language_query(search):
-            comps = [c for c in comps if search.lower() in c.lower()]
+        if name_filter:
+            comps = [c for c in comps if name_filter in c.lower()]
 
         if not comps:
             st.info("No competitions found.")
@@ -2176,7 +2236,7 @@ def main_app():
             if overall_ladder:
                 overall_ladder_df = pd.DataFrame(overall_ladder)
                 overall_ladder_df.insert(0, "Rank", range(1, len(overall_ladder_df) + 1))
-                overall_display_df = overall_ladder_df[["Rank", "club", "played", "wins", "draws", "losses", "gf", "ga", "gd", "points"]].copy()
+                overall_display_df = overall_ladder_df[["Rank", "club", "played", "wins", "draws", "losses", "gf", "ga", "gd", "points"]]
                 overall_display_df.columns = ["Rank", "Club", "P", "W", "D", "L", "GF", "GA", "GD", "Pts"]
                 st.dataframe(
                     overall_display_df,
@@ -2201,23 +2261,10 @@ def main_app():
                 
         with tab_old:
             if league in comp_overview:
-                data = comp_overview[league]
-                age_groups = data.get("age_groups", [])
-                rows = []
-                for club in data.get("clubs", []):
-                    row = {
-                        "Rank": club.get("overall_rank", 0),
-                        "Club": base_club_name(club.get("club", "")),
-                        "Points": club.get("total_position_points", 0),
-                    }
-                    for age in age_groups:
-                        pos = club.get("age_groups", {}).get(age, {}).get("position")
-                        row[age] = pos if pos else "-"
-                    row["GF"] = club.get("total_gf", 0)
-                    row["GA"] = club.get("total_ga", 0)
-                    row["GD"] = club.get("total_gf", 0) - club.get("total_ga", 0)
-                    rows.append(row)
-                df_overview = pd.DataFrame(rows)
+                age_groups = comp_overview[league].get("age_groups", [])
+                df_overview = cached_overview_table(
+                    _data_file_version("competition_overview.json"), league, comp_overview
+                )
                 configs = {
                     "Rank": st.column_config.NumberColumn("Rank", width="small"),
                     "Club": st.column_config.TextColumn("Club", width="large"),
@@ -2248,7 +2295,7 @@ def main_app():
 
         ladder_df = pd.DataFrame(ladder)
         ladder_df.insert(0, "Pos", range(1, len(ladder_df) + 1))
-        ladder_df["ClubDisplay"] = ladder_df["club"].apply(base_club_name)
+        ladder_df["ClubDisplay"] = base_club_name_series(ladder_df["club"])
         
         st.markdown("---")
 
@@ -2309,10 +2356,10 @@ def main_app():
             
             with col_matches:
                 st.markdown(f"### 📅 Matches")
-                matches = get_matches_for_club_in_comp(results, club, comp)
+                matches = club_match_index(_results_version(), results).get((comp, club), [])
 
                 if matches:
-                    match_rows = []
+                    m_dates, m_home_away, m_opponents, m_scores, m_ids = [], [], [], [], []
                     for m in matches:
                         attrs = m.get("attributes", {})
                         home = attrs.get("home_team_name")
@@ -2331,48 +2378,40 @@ def main_app():
                         else:
                             score = ""
 
-                        match_rows.append({
-                            "Select": False,
-                            "Date": format_date(attrs.get("date", "")),
-                            "H/A": home_away,
-                            "Opponent": base_club_name(opponent),
-                            "Score": score,
-                            "_match_hash_id": attrs.get("match_hash_id"),
-                        })
-
-                    df_matches = pd.DataFrame(match_rows)
-                    df_matches["Select"] = df_matches["Select"].astype(bool)
-
-                    # Pre-tick the currently selected match
-                    current_id = st.session_state.get("selected_match_id")
-                    if current_id:
-                        df_matches["Select"] = df_matches["_match_hash_id"] == current_id
-
-                    edited_matches = st.data_editor(
-                        df_matches[["Select", "Date", "H/A", "Opponent", "Score"]],
+                        m_dates.append(format_date(attrs.get("date", "")))
+                        m_home_away.append(home_away)
+                        m_opponents.append(base_club_name(opponent))
+                        m_scores.append(score)
+                        m_ids.append(attrs.get("match_hash_id"))
+
+                    df_matches = pd.DataFrame({
+                        "Date": m_dates,
+                        "H/A": m_home_away,
+                        "Opponent": m_opponents,
+                        "Score": m_scores,
+                    })
+
+                    # Row selection replaces the old Select checkbox column
+                    match_sel = st.dataframe(
+                        df_matches,
                         hide_index=True,
                         column_config={
-                            "Select": st.column_config.CheckboxColumn("", default=False, width="small"),
                             "Date": st.column_config.TextColumn("Date", width="small"),
                             "H/A": st.column_config.TextColumn("", width="small"),
                             "Opponent": st.column_config.TextColumn("Opponent", width="medium"),
                             "Score": st.column_config.TextColumn("Score", width="small")
                         },
-                        disabled=["Date", "H/A", "Opponent", "Score"],
                         use_container_width=False,
-                        key="club_matches_editor"
+                        selection_mode="single-row", on_select="rerun",
+                        key=f"club_matches_sel_{comp}_{club}"
                     )
 
-                    # Single clean selection block — no duplicates
-                    selected_rows = edited_matches[edited_matches["Select"] == True]
-                    if not selected_rows.empty:
-                        new_match_id = df_matches.iloc[selected_rows.index[0]]["_match_hash_id"]
-                        if st.session_state.get("selected_match_id") != new_match_id:
-                            st.session_state["selected_match_id"] = new_match_id
-                            st.rerun()
-                    elif st.session_state.get("selected_match_id") is not None:
-                        st.session_state["selected_match_id"] = None
-                        st.rerun()
+                    # Single clean selection block — no duplicates. The squad panel
+                    # reads selected_match_id further down this same run, so the
+                    # selection's own rerun is enough (no second st.rerun()).
+                    selected_rows = match_sel.selection.get("rows", [])
+                    st.session_state["selected_match_id"] = (
+                        m_ids[selected_rows[0]] if selected_rows else None)
                 else:
                     st.info(f"No matches found")
 
@@ -2382,10 +2421,10 @@ def main_app():
                 # Get all people (players + staff) for this club in this competition
                 all_people = get_players_for_club(players_data, club, comp, staff_data)
 
-                if search and not is_natural_language_query(search):
+                if name_filter:
                     all_people = [
                         p for p in all_people
-                        if search.lower() in f"{p.get('first_name','')} {p.get('last_name','')}".lower()
+                        if name_filter in f"{p.get('first_name','')} {p.get('last_name','')}".lower()
                     ]
 
                 selected_match_id = st.session_state.get("selected_match_id")
@@ -2416,21 +2455,20 @@ def main_app():
                 # Separate players and non-players
 #                players = [p for p in all_people if not p.get("role") or p.get("role") == "player"]
 #                non_players = [p for p in all_people if p.get("role") and p.get("role") != "player"]
-                players = [
-                    p for p in all_people 
-                    if not p.get("role") or p.get("role").lower() == "player"
-                ]
-
-                non_players = [
-                    p for p in all_people 
-                    if p.get("role") and p.get("role").lower() != "player"
-                ]
+                players, non_players = [], []
+                for p in all_people:
+                    role = p.get("role")
+                    if not role or role.lower() == "player":
+                        players.append(p)
+                    else:
+                        non_players.append(p)
                 # PLAYERS TABLE
                 if players:
                     st.markdown("**Players**")
                     if any(len(p.get("teams", [])) > 1 for p in players):
                         st.caption("🔁 = also plays another age group at this club · ⚡ = also registered at a different club")
-                    rows = []
+                    p_rows = []
+                    ages, names, jerseys, apps, goals, yellows, reds = [], [], [], [], [], [], []
                     for p in players:
                         full_name   = f"{p.get('first_name','')} {p.get('last_name','')}"
                         reg         = get_player_reg_info(p, club, comp)
@@ -2444,46 +2482,51 @@ def main_app():
 
                         if selected_match_id:
                             match_data = get_player_match_stats(p, selected_match_id)
-                            if match_data:
-                                indicators = []
-                                if match_data.get("captain"): indicators.append("(C)")
-                                if match_data.get("goalie"):  indicators.append("🥅")
-                                if indicators:
-                                    full_name = f"{full_name} {' '.join(indicators)}"
-                                events = match_data.get("events", [])
-                                def _etype(e): return (e.get("type") or e.get("event_type") or "").lower()
-                                goals_m   = sum(1 for e in events if _etype(e) == "goal")
-                                yellows_m = sum(1 for e in events if _etype(e) == "yellow_card")
-                                reds_m    = sum(1 for e in events if _etype(e) == "red_card")
-                                is_captain = (
-                                    match_data.get("captain") or
-                                    match_data.get("role_in_match", "").lower() == "captain" or
-                                    p.get("stats", {}).get("matches_captained", 0) > 0
-                                )
-                                if is_captain and "(C)" not in full_name:
-                                    full_name = f"{full_name} (C)"
-                                rows.append({
-                                    "Select": False, "Age": player_age,
-                                    "Player": f"{full_name}{dual_badge}", "#": jersey,
-                                    "M": 1, "G": goals_m, "🟨": yellows_m, "🟥": reds_m,
-                                })
+                            if not match_data:
+                                continue
+                            indicators = []
+                            if match_data.get("captain"): indicators.append("(C)")
+                            if match_data.get("goalie"):  indicators.append("🥅")
+                            if indicators:
+                                full_name = f"{full_name} {' '.join(indicators)}"
+                            events = match_data.get("events", [])
+                            def _etype(e): return (e.get("type") or e.get("event_type") or "").lower()
+                            goals_m   = sum(1 for e in events if _etype(e) == "goal")
+                            yellows_m = sum(1 for e in events if _etype(e) == "yellow_card")
+                            reds_m    = sum(1 for e in events if _etype(e) == "red_card")
+                            is_captain = (
+                                match_data.get("captain") or
+                                match_data.get("role_in_match", "").lower() == "captain" or
+                                p.get("stats", {}).get("matches_captained", 0) > 0
+                            )
+                            if is_captain and "(C)" not in full_name:
+                                full_name = f"{full_name} (C)"
+                            m_played = 1
                         else:
-                            rows.append({
-                                "Select": False, "Age": player_age,
-                                "Player": f"{full_name}{dual_badge}", "#": jersey,
-                                "M": len([m for m in p.get("matches", [])
-                                          if m.get("available", False) or m.get("started", False)]),
-                                "G": p.get("stats", {}).get("goals", 0),
-                                "🟨": p.get("stats", {}).get("yellow_cards", 0),
-                                "🟥": p.get("stats", {}).get("red_cards", 0),
-                            })
-
-                    df_players = pd.DataFrame(rows)
-                    df_players["Select"] = df_players["Select"].astype(bool)
-                    edited_players = st.data_editor(
+                            stats = p.get("stats", {})
+                            m_played = len([m for m in p.get("matches", [])
+                                            if m.get("available", False) or m.get("started", False)])
+                            goals_m = stats.get("goals", 0)
+                            yellows_m = stats.get("yellow_cards", 0)
+                            reds_m = stats.get("red_cards", 0)
+                        p_rows.append(p)
+                        ages.append(player_age)
+                        names.append(f"{full_name}{dual_badge}")
+                        jerseys.append(jersey)
+                        apps.append(m_played)
+                        goals.append(goals_m)
+                        yellows.append(yellows_m)
+                        reds.append(reds_m)
+
+                    df_players = pd.DataFrame({
+                        "Age": ages, "Player": names, "#": jerseys,
+                        "M": apps, "G": goals, "🟨": yellows, "🟥": reds,
+                    })
+                    # Key changes with the match filter (different rows) and on
+                    # ✖ Close (clears the highlighted row).
+                    player_sel = st.dataframe(
                         df_players, hide_index=True,
                         column_config={
-                            "Select": st.column_config.CheckboxColumn("", help="View details", default=False),
                             "Age":    st.column_config.TextColumn("Age", width="small"),
                             "Player": st.column_config.TextColumn("Player", width="medium"),
                             "#":      st.column_config.TextColumn("#", width="small"),
@@ -2492,18 +2535,18 @@ def main_app():
                             "🟨":     st.column_config.NumberColumn("🟨", width="small"),
                             "🟥":     st.column_config.NumberColumn("🟥", width="small"),
                         },
-                        disabled=["Age", "Player", "#", "M", "G", "🟨", "🟥"],
-                        use_container_width=False, height=730, key="players_editor"
+                        use_container_width=False, height=730,
+                        selection_mode="single-row", on_select="rerun",
+                        key=f"players_sel_{comp}_{club}_{selected_match_id}_{st.session_state.get('_squad_sel_nonce', 0)}"
                     )
 
-                    selected_player_rows = edited_players[edited_players["Select"] == True]
-                    if not selected_player_rows.empty:
-                        idx = selected_player_rows.index[0]
-                        selected_player = players[idx]
-                        # Stay on ladder_clubs — show details below instead of navigating away
+                    selected_player_rows = player_sel.selection.get("rows", [])
+                    if selected_player_rows:
+                        selected_player = p_rows[selected_player_rows[0]]
+                        # Stay on ladder_clubs — show details below instead of navigating away;
+                        # the detail panel is drawn later in this run, so no st.rerun()
                         if st.session_state.get("selected_player") != selected_player:
                             st.session_state["selected_player"] = selected_player
-                            player_name = f"{selected_player.get('first_name','')} {selected_player.get('last_name','')}"
                             log_view(
                                 username=st.session_state["username"],
                                 full_name=st.session_state["full_name"],
@@ -2511,14 +2554,10 @@ def main_app():
                                 league=league,
                                 competition=comp,
                                 club=club,
-                                player=player_name,
                                 session_id=st.session_state["session_id"]
                             )
-                            st.rerun()
-                    else:
-                        if st.session_state.get("selected_player") is not None:
-                            st.session_state["selected_player"] = None
-                            st.rerun()
+                    elif st.session_state.get("selected_player") is not None:
+                        st.session_state["selected_player"] = None
                 else:
                     if selected_match_id:
                         st.info("No players in selected match")
@@ -2587,6 +2626,7 @@ def main_app():
                     with col_px:
                         if st.button("✖ Close", key="close_player_detail"):
                             st.session_state["selected_player"] = None
+                            st.session_state["_squad_sel_nonce"] = st.session_state.get("_squad_sel_nonce", 0) + 1
                             st.rerun()
 
                     player_matches = sorted(
@@ -2736,7 +2776,7 @@ def main():
             st.session_state["player_age_group"] = matched.get("age_group", "")
             st.session_state["player_role"] = matched["role"]
             st.session_state["role"] = matched["role"]
-            st.session_state["last_activity"] = datetime.now()
+            st.session_state["last_activity"] = time.monotonic()
             st.session_state["player_league"] = league
             st.session_state["player_competition"] = competition
             update_user_config(matched["club"], matched.get("age_group", ""))
@@ -5,10 +5,20 @@
 # ================================================
 
 import hashlib
+import hmac
 import json
 import os
+import shutil
 import sys
 
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ---------------------------------------------------------
 # Try to import Streamlit (only available when app is running)
 # ---------------------------------------------------------
@@ -80,6 +90,20 @@ USERS_CONFIG_PATH = os.path.join(BASE_DIR, "users_config.json")
 # Build default users from secrets/env vars
 # ---------------------------------------------------------
 
+# Hashes for the secrets/env/default users, by username. build_default_users()
+# runs on every load_users() call while there is no users file, and each
+# Argon2id hash is deliberately slow, so each user is hashed once per process.
+# Keyed on the username alone so no plaintext password is kept around; a
+# changed secret therefore takes effect on the next restart.
+_default_password_hashes = {}
+
+def _default_password_hash(username: str, password: str) -> str:
+    """hash_password(password), computed once per username"""
+    password_hash = _default_password_hashes.get(username)
+    if password_hash is None:
+        password_hash = _default_password_hashes[username] = hash_password(password)
+    return password_hash
+
 def build_default_users():
     """Build default users using passwords from secrets/env vars"""
     users = {}
@@ -94,7 +118,7 @@ def build_default_users():
             
             for username in passwords.keys():
                 users[username] = {
-                    "password_hash": hash_password(passwords[username]),
+                    "password_hash": _default_password_hash(username, passwords[username]),
                     "role": roles.get(username, "user"),
                     "full_name": full_names.get(username, username.title())
                 }
@@ -116,7 +140,7 @@ def build_default_users():
             full_name = os.environ.get(f"DRIBL_NAME_{username.upper()}", username.title())
             
             env_users[username] = {
-                "password_hash": hash_password(password),
+                "password_hash": _default_password_hash(username, password),
                 "role": role,
                 "full_name": full_name
             }
@@ -127,17 +151,17 @@ def build_default_users():
     # Final fallback: Hardcoded defaults (only for initial setup)
     return {
         "admin": {
-            "password_hash": hash_password("admin123"),
+            "password_hash": _default_password_hash("admin", "admin123"),
             "role": "admin",
             "full_name": "Administrator"
         },
         "coach": {
-            "password_hash": hash_password("coach123"),
+            "password_hash": _default_password_hash("coach", "coach123"),
             "role": "user",
             "full_name": "Coach"
         },
         "parent": {
-            "password_hash": hash_password("parent123"),
+            "password_hash": _default_password_hash("parent", "parent123"),
             "role": "user",
             "full_name": "Parent"
         }
@@ -147,30 +171,82 @@ def build_default_users():
 # User Management Functions
 # ---------------------------------------------------------
 
+# Parsed users file as (mtime_ns, users); reused until the file changes
+_users_cache = None
+
 def load_users():
     """Load users from config file or build from secrets"""
-    if os.path.exists(USERS_CONFIG_PATH):
-        try:
-            with open(USERS_CONFIG_PATH, 'r') as f:
-                return json.load(f)
-        except:
-            pass
-    
+    global _users_cache
+    # Single stat per call: a missing file fails here and falls back below
+    try:
+        mtime = os.stat(USERS_CONFIG_PATH).st_mtime_ns
+        if _users_cache is not None and _users_cache[0] == mtime:
+            return _users_cache[1]
+        with open(USERS_CONFIG_PATH, 'rb') as f:
+            raw = f.read()
+        users = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        _users_cache = (mtime, users)
+        return users
+    except:
+        pass
+
     # If no config file, build from secrets
     return build_default_users()
 
 def save_users(users):
-    """Save users to config file"""
-    with open(USERS_CONFIG_PATH, 'w') as f:
-        json.dump(users, f, indent=2)
+    """Save users to config file (temp file + rename, so it is never left half-written)"""
+    global _users_cache
+    # Callers edit the loaded dict in place, so drop it even if the write fails
+    _users_cache = None
+    if orjson is not None:
+        data = orjson.dumps(users, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(users, indent=2).encode()
+    tmp_path = USERS_CONFIG_PATH + ".tmp"
+    # Owner-only by default; an existing file keeps its own mode across the rename
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(USERS_CONFIG_PATH):
+            shutil.copymode(USERS_CONFIG_PATH, tmp_path)
+        os.replace(tmp_path, USERS_CONFIG_PATH)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+# Stored passwords use Argon2id (salted PHC string). Hashes written before
+# the switch are bare SHA256 hex digests; they still verify, and are
+# re-hashed the next time that user logs in.
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
 
 def hash_password(password: str) -> str:
-    """Hash a password using SHA256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password using Argon2id"""
+    return _password_hasher.hash(password)
 
 def verify_password(password: str, password_hash: str) -> bool:
-    """Verify a password against its hash"""
-    return hash_password(password) == password_hash
+    """Verify a password against its hash (Argon2id or legacy SHA256)"""
+    if password_hash.startswith("$argon2"):
+        try:
+            return _password_hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    legacy_hash = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(legacy_hash.encode(), password_hash.encode())
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """True for legacy SHA256 hashes and Argon2 hashes with outdated parameters"""
+    if not password_hash.startswith("$argon2"):
+        return True
+    try:
+        return _password_hasher.check_needs_rehash(password_hash)
+    except InvalidHashError:
+        return True
 
 def authenticate_user(username: str, password: str) -> dict:
     """
@@ -182,6 +258,15 @@ def authenticate_user(username: str, password: str) -> dict:
     if username in users:
         user_data = users[username]
         if verify_password(password, user_data['password_hash']):
+            # Upgrade the stored hash, but only when users came from the file
+            # (not rebuilt from secrets after a missing or unreadable file)
+            if (password_needs_rehash(user_data['password_hash'])
+                    and _users_cache is not None and _users_cache[1] is users):
+                user_data['password_hash'] = hash_password(password)
+                try:
+                    save_users(users)
+                except OSError:
+                    pass
             return {
                 'username': username,
                 'role': user_data.get('role', 'user'),
@@ -234,12 +319,17 @@ def change_password(username: str, old_password: str, new_password: str):
     save_users(users)
     return True, "Password changed successfully"
 
+def get_role(username: str):
+    """Role of a user ('admin'/'user'), or None if there is no such user"""
+    user_data = load_users().get(username)
+    return user_data.get('role', 'user') if user_data else None
+
 def reset_password(username: str, new_password: str, admin_username: str):
     """Admin function to reset user password (CLI only)"""
     users = load_users()
     
     # Verify admin role
-    if admin_username not in users or users[admin_username].get('role') != 'admin':
+    if users.get(admin_username, {}).get('role') != 'admin':
         return False, "Admin privileges required"
     
     if username not in users:
@@ -303,9 +393,9 @@ def print_security_status():
         print("ℹ️  Streamlit not available (CLI mode)")
     
     # Check environment variables
-    env_vars = [k for k in os.environ.keys() if k.startswith("DRIBL_PASSWORD_")]
-    if env_vars:
-        print(f"✅ Environment variables set: {len(env_vars)} passwords")
+    env_var_count = sum(k.startswith("DRIBL_PASSWORD_") for k in os.environ)
+    if env_var_count:
+        print(f"✅ Environment variables set: {env_var_count} passwords")
     else:
         print("⚠️  No environment variables set")
     
@@ -317,7 +407,7 @@ def print_security_status():
         print("⚠️  No users config file (will use defaults)")
     
     print("\n📝 RECOMMENDATIONS:")
-    if not HAS_STREAMLIT and not env_vars and not os.path.exists(USERS_CONFIG_PATH):
+    if not HAS_STREAMLIT and not env_var_count and not os.path.exists(USERS_CONFIG_PATH):
         print("   1. For Streamlit Cloud: Set passwords in app secrets")
         print("   2. For local dev: Copy secrets_template.toml to .streamlit/secrets.toml")
         print("   3. For CLI: Run 'python manage_users.py' to set passwords")
@@ -19,9 +19,15 @@ import pytz
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
 
 from rapidfuzz import process, fuzz
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ---------------------------------------------------------
 # USER CONFIGURATION
 # ---------------------------------------------------------
@@ -201,8 +207,12 @@ def load_json(name: str):
     
     for path in possible_paths:
         if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            # orjson decodes the raw bytes directly; json is the fallback
+            with open(path, "rb") as f:
+                raw = f.read()
+            if orjson is not None:
+                return orjson.loads(raw)
+            return json.loads(raw)
     
     # Return appropriate empty data structure based on filename
     if "players_summary" in name:
@@ -375,7 +385,10 @@ staff_summary   = [_normalize_person(p, is_player=False) for p in _raw_s]
 # ---------------------------------------------------------
 # 2. Date formatting helper
 # ---------------------------------------------------------
+# The formatters are pure str -> str and run once per row of every match
+# table, over a small set of distinct dates — memoise on the raw string.
 
+@lru_cache(maxsize=4096)
 def format_date(date_str: str) -> str:
     """Convert date string to dd-mmm format (e.g., 09-Feb)"""
     if not date_str:
@@ -387,6 +400,7 @@ def format_date(date_str: str) -> str:
     except (ValueError, AttributeError):
         return date_str[:10] if len(date_str) >= 10 else date_str
 
+@lru_cache(maxsize=4096)
 def format_date_full(date_str: str) -> str:
     """Convert date string to dd-mmm-yyyy format (e.g., 09-Feb-2026)"""
     if not date_str:
@@ -398,6 +412,7 @@ def format_date_full(date_str: str) -> str:
     except (ValueError, AttributeError):
         return date_str[:10] if len(date_str) >= 10 else date_str
 
+@lru_cache(maxsize=4096)
 def iso_date(date_str: str) -> str:
     """Return YYYY-MM-DD (ISO) string for use in st.dataframe Date columns.
     Streamlit DateColumn needs ISO format to sort correctly.
@@ -412,6 +427,7 @@ def iso_date(date_str: str) -> str:
         return ""
 
 
+@lru_cache(maxsize=4096)
 def format_date_aest(date_str: str) -> str:
     """Convert UTC date string to dd-mmm format using AEST/AEDT local time."""
     if not date_str:
@@ -426,6 +442,7 @@ def format_date_aest(date_str: str) -> str:
     except (ValueError, AttributeError):
         return date_str[:10] if len(date_str) >= 10 else date_str
 
+@lru_cache(maxsize=4096)
 def format_date_full_aest(date_str: str) -> str:
     """Convert UTC date string to dd-mmm-yyyy format using AEST/AEDT local time."""
     if not date_str:
@@ -4260,9 +4277,12 @@ def tool_non_players(query: str = "") -> str:
 # 11B. DUAL REGISTRATION / PLAYING IN MULTIPLE TEAMS
 # ---------------------------------------------------------
 
+_AGE_GROUP_SUFFIX_RE = re.compile(r'\s+U\d{2}$', re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
 def _strip_age_group(team_name: str) -> str:
     """Strip age group suffix to get base club name. E.g. 'Heidelberg United FC U16' -> 'Heidelberg United FC'"""
-    return re.sub(r'\s+U\d{2}$', '', (team_name or ""), flags=re.IGNORECASE).strip()
+    return _AGE_GROUP_SUFFIX_RE.sub('', (team_name or "")).strip()
 
 
 def tool_dual_registration(query: str = "", different_clubs_only: bool = False) -> Any:
@@ -5846,6 +5866,12 @@ class FastQueryRouter:
     """Enhanced pattern-based query router with personal team support"""
     def __init__(self):
         pass
+
+    def reload_data(self):
+        """Re-read the JSON data files now, updating the module data in place."""
+        if hasattr(_load_all_data, "clear"):
+            _load_all_data.clear()
+        _refresh_data()
         
     def process(self, query: str):
         """Route query to appropriate handler"""
@@ -5,6 +5,7 @@
 # ================================================
 
 import hashlib
+import hmac
 import json
 import os
 import sqlite3
@@ -374,7 +375,9 @@ def verify_admin(username: str, password: str) -> Optional[Dict]:
     try:
         creds = st.secrets["admin_credentials"]
         
-        if username == creds["username"] and password == creds["password"]:
+        # Constant-time password check; encode so non-ASCII input is allowed
+        if (username == creds["username"]
+                and hmac.compare_digest(password.encode(), str(creds["password"]).encode())):
             return {
                 "username": creds["username"],
                 "full_name": creds["full_name"]